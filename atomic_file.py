@@ -0,0 +1,40 @@
+"""
+Atomic File Writes
+==================
+
+Files the server reads while they may be rewritten (cache entries, the
+shared content file, notebook images) are written to a temp file next
+to their destination and renamed over it, so a reader only ever sees
+the old file or the complete new one.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Union
+
+
+def atomic_write(path: Union[str, Path], data: Union[bytes, Iterable[bytes]]):
+    """
+    Write data (bytes, or chunks of bytes) to path in one rename. On any
+    error the temp file is removed and the error raised; path is untouched.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+        # mkstemp creates the file private to its owner
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Frontmatter reader benchmark
+============================
+
+Compares the old "read whole file, split on '---', yaml.safe_load"
+approach with frontmatter_reader.read_frontmatter on a synthetic corpus.
+
+    python benchmarks/bench_frontmatter.py --files 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frontmatter_reader import read_frontmatter  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+
+def split_and_safe_load(filepath):
+    """The approach the managers used before frontmatter_reader"""
+    content = filepath.read_text(encoding='utf-8')
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            return yaml.safe_load(parts[1]) or {}
+    return {}
+
+
+def timed(label, func, files, baseline=None):
+    start = time.perf_counter()
+    for filepath in files:
+        func(filepath)
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  {elapsed / len(files) * 1e6:7.1f} µs/file{speedup}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=5000, help='number of synthetic files')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_corpus(tmp, args.files)
+        files = sorted(root.glob('*/*.md'))
+        print(f"📄 {len(files)} files, libyaml available: {yaml.__with_libyaml__}")
+        print("=" * 72)
+
+        baseline = timed("split + yaml.safe_load", split_and_safe_load, files)
+        timed("read_frontmatter (header only)", lambda f: read_frontmatter(f, with_body=False), files, baseline)
+        timed("read_frontmatter (header + body)", read_frontmatter, files, baseline)
+
+
+if __name__ == "__main__":
+    main()
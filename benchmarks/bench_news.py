@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+News listing benchmark
+======================
+
+Times GET /en/news (and the homepage, which lists the latest news) on a
+synthetic corpus through FastAPI's TestClient, with the indexes warm so
+only the listing render is measured.
+
+    python benchmarks/bench_news.py --files 5000 --requests 200
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from blog_manager import BlogManager  # noqa: E402
+from news_manager import NewsManager  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+
+def timed_requests(client, path, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(path)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return latencies
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=5000, help='number of synthetic files')
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_corpus(tmp, args.files)
+        main.news_manager = NewsManager(str(root / 'news'))
+        main.blog_manager = BlogManager(str(root / 'blog'))
+        # Loaded once, as the server does at startup; rescans happen off the request path
+        for manager in (main.news_manager, main.blog_manager):
+            manager.repository.refresh()
+            manager.repository.auto_refresh = False
+
+        client = TestClient(main.app)
+        print(f"📄 {args.files} files, {len(main.news_manager.get_news_items('en'))} English news items")
+        print("=" * 60)
+        for path in ('/en/news', '/en/'):
+            client.get(path)
+            latencies = timed_requests(client, path, args.requests)
+            print(f"{path:<12} mean {statistics.mean(latencies) * 1000:7.2f} ms   "
+                  f"p50 {statistics.median(latencies) * 1000:7.2f} ms   "
+                  f"max {max(latencies) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main_benchmark()
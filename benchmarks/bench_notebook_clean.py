@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Notebook HTML cleaning benchmark
+================================
+
+Converts synthetic notebooks with thousands of cells once with nbconvert,
+then times cleaning the output with the previous regex-based _clean_html
+and with the single-pass sanitizer (html_sanitizer.py), for growing
+notebook sizes, so how each scales is visible.
+
+    python benchmarks/bench_notebook_clean.py --cells 500 1000 2000 4000
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nbformat
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from nbconvert import HTMLExporter  # noqa: E402
+
+from html_sanitizer import clean_notebook_html  # noqa: E402
+from notebook_manager import NotebookManager  # noqa: E402
+
+
+def regex_clean_html(html: str) -> str:
+    """_clean_html before html_sanitizer.py, for comparison"""
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL)
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
+    content_match = re.search(r'<div[^>]*class="[^"]*jp-Notebook[^"]*"[^>]*>(.*?)</div>\s*$', html, re.DOTALL)
+    if content_match:
+        return f'<div class="notebook-content">{content_match.group(1)}</div>'
+    content_match = re.search(r'<div[^>]*class="[^"]*cell[^"]*"[^>]*>.*?</div>', html, re.DOTALL)
+    if content_match:
+        cell_matches = re.findall(r'<div[^>]*class="[^"]*cell[^"]*"[^>]*>.*?</div>', html, re.DOTALL)
+        return f'<div class="notebook-content">{"".join(cell_matches)}</div>'
+    return f'<div class="notebook-content">{html}</div>'
+
+
+def converted_notebook(cells: int, directory: Path) -> str:
+    notebook = nbformat.v4.new_notebook()
+    for index in range(cells):
+        if index % 2:
+            cell = nbformat.v4.new_code_cell(f"x_{index} = {index} * 2\nprint(x_{index})")
+            cell.outputs = [nbformat.v4.new_output('stream', name='stdout', text=f"{index * 2}\n")]
+        else:
+            cell = nbformat.v4.new_markdown_cell(f"## Step {index}\n\nSome *notes* about step {index}.")
+        cell.id = f"cell-{index}"
+        notebook.cells.append(cell)
+    path = directory / f"cells-{cells}.ipynb"
+    nbformat.write(notebook, str(path))
+
+    exporter = HTMLExporter()
+    for name, value in NotebookManager.EXPORTER_SETTINGS.items():
+        setattr(exporter, name, value)
+    body, _ = exporter.from_filename(str(path))
+    return body
+
+
+def best_of(function, html, repeat=3):
+    """Fastest of `repeat` runs; a run over a second is not repeated"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(html)
+        times.append(time.perf_counter() - start)
+        if times[-1] > 1:
+            break
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cells', type=int, nargs='+', default=[500, 1000, 2000, 4000], help='notebook sizes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'cells':>6} {'HTML':>9} {'regex':>10} {'kept':>9} {'sanitizer':>10} {'kept':>9}")
+        print("=" * 60)
+        for cells in args.cells:
+            html = converted_notebook(cells, Path(tmp))
+            regex_time, regex_result = best_of(regex_clean_html, html)
+            sanitizer_time, sanitizer_result = best_of(clean_notebook_html, html)
+            print(f"{cells:>6} {len(html) / 1024:>7.0f} KB {regex_time * 1000:>7.1f} ms "
+                  f"{len(regex_result) / 1024:>6.0f} KB {sanitizer_time * 1000:>7.1f} ms "
+                  f"{len(sanitizer_result) / 1024:>6.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
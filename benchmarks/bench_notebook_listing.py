@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Notebook listing benchmark
+==========================
+
+Lists a directory of synthetic notebooks, each with a few megabytes of
+plot outputs, the way the homepage, /notebooks and /academic do, and
+compares reading every notebook in full (json.load) with the metadata
+scan of notebook_metadata.py. Reports time and bytes read, the latter
+from /proc/self/io (Linux only).
+
+    python benchmarks/bench_notebook_listing.py --notebooks 50 --plot-kib 1024
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from notebook_manager import NotebookManager  # noqa: E402
+
+
+def write_notebooks(directory: Path, count: int, plot_kib: int):
+    for index in range(count):
+        cells = [{'cell_type': 'markdown', 'id': 'intro', 'metadata': {}, 'source': [f'# Analysis {index}\n']}]
+        for plot in range(3):
+            cells.append({'cell_type': 'code', 'execution_count': plot, 'id': f'plot-{plot}', 'metadata': {},
+                          'outputs': [{'data': {'image/png': 'iVBOR' * (plot_kib * 205)}, 'metadata': {},
+                                       'output_type': 'display_data'}],
+                          'source': ['plt.show()']})
+        notebook = {'cells': cells, 'metadata': {'custom': {'date': f'2024-01-{index % 28 + 1:02d}'}},
+                    'nbformat': 4, 'nbformat_minor': 5}
+        (directory / f'analysis-{index:03d}.ipynb').write_text(json.dumps(notebook, indent=1), encoding='utf-8')
+
+
+def bytes_read() -> int:
+    with open('/proc/self/io') as f:
+        for line in f:
+            if line.startswith('rchar:'):
+                return int(line.split()[1])
+    return 0
+
+
+def full_load(directory: Path):
+    for path in directory.glob('*.ipynb'):
+        with open(path, 'r', encoding='utf-8') as f:
+            json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notebooks', type=int, default=50, help='number of notebooks')
+    parser.add_argument('--plot-kib', type=int, default=1024, help='size of each of the three plots')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_notebooks(directory, args.notebooks, args.plot_kib)
+        total = sum(path.stat().st_size for path in directory.glob('*.ipynb'))
+        print(f"📓 {args.notebooks} notebooks, {total / 1024 / 1024:.1f} MB in total")
+        print("=" * 60)
+        for label, run in (('json.load', lambda: full_load(directory)),
+                           ('metadata scan', lambda: NotebookManager(str(directory)).get_notebooks())):
+            before = bytes_read()
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            per_notebook = (bytes_read() - before) / args.notebooks / 1024
+            print(f"{label:<14} {elapsed * 1000:9.1f} ms   {per_notebook:9.1f} KiB read per notebook")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
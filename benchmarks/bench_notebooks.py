@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Notebook conversion benchmark
+=============================
+
+Starts a single `uvicorn main:app` worker, requests N distinct notebooks
+that have not been converted yet all at once, and meanwhile times an
+unrelated page (the blog listing) to see how much the conversions stall
+everything else. Also reports how the notebook requests were answered.
+
+    python benchmarks/bench_notebooks.py --notebooks 8 --requests 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / 'benchmarks'))
+
+from bench_workers import free_port  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+
+
+def site_root(tmp: Path, files: int, notebooks: int) -> Path:
+    """Synthetic content plus copies of the sample notebook, each with different bytes"""
+    root = tmp / 'site'
+    write_corpus(root / 'content', files)
+    notebook_dir = root / 'content' / 'notebooks'
+    notebook_dir.mkdir()
+    sample = json.loads((REPO / 'content' / 'notebooks' / 'test-analysis.ipynb').read_text(encoding='utf-8'))
+    for index in range(notebooks):
+        sample['cells'].append({'cell_type': 'markdown', 'id': f'copy-{index}', 'metadata': {},
+                                'source': [f'Copy {index}']})
+        (notebook_dir / f'notebook-{index:03d}.ipynb').write_text(json.dumps(sample), encoding='utf-8')
+    for name in ('static', 'templates', 'locales'):
+        (root / name).symlink_to(REPO / name)
+    return root
+
+
+def get(url: str):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=500, help='number of synthetic content files')
+    parser.add_argument('--notebooks', type=int, default=8, help='distinct notebooks requested at once')
+    parser.add_argument('--requests', type=int, default=200, help='blog listing requests timed')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = site_root(Path(tmp), args.files, args.notebooks)
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        env = dict(os.environ, PYTHONPATH=str(REPO), CONTENT_CACHE='0')
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--no-access-log'],
+            cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                try:
+                    if get(f"{base}/en/blog")[0] == 200:
+                        break
+                except OSError:
+                    time.sleep(0.05)
+            idle = [get(f"{base}/en/blog")[1] for _ in range(args.requests)]
+
+            statuses = Counter()
+            notebook_times = []
+
+            def view(index):
+                status, elapsed = get(f"{base}/en/notebooks/notebook-{index:03d}")
+                statuses[status] += 1
+                notebook_times.append(elapsed)
+
+            threads = [threading.Thread(target=view, args=(index,)) for index in range(args.notebooks)]
+            for thread in threads:
+                thread.start()
+            busy = [get(f"{base}/en/blog")[1] for _ in range(args.requests)]
+            for thread in threads:
+                thread.join()
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"📓 {args.notebooks} notebooks converting, {os.cpu_count()} CPUs, {args.requests} requests")
+    print("=" * 60)
+    for label, latencies in (('idle', idle), ('converting', busy)):
+        print(f"/en/blog {label:<11} p50 {statistics.median(latencies) * 1000:8.2f} ms"
+              f"   p99 {percentile(latencies, 0.99) * 1000:8.2f} ms")
+    answered = ', '.join(f"{count}x {status}" for status, count in sorted(statuses.items()))
+    print(f"notebook views   {answered}, slowest {max(notebook_times):.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
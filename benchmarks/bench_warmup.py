@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Startup warm-up benchmark
+=========================
+
+Times content_repository.warm_up on a synthetic corpus, rendering every
+file in-process and then across a process pool.
+
+    python benchmarks/bench_warmup.py --files 10000 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_manager import BlogPost  # noqa: E402
+from content_repository import ContentRepository, warm_up  # noqa: E402
+from news_manager import NewsItem  # noqa: E402
+from publications_manager import Publication  # noqa: E402
+from synthetic_corpus import write_corpus  # noqa: E402
+from talks_manager import Talk  # noqa: E402
+from teaching_manager import TeachingItem  # noqa: E402
+
+ITEM_CLASSES = {
+    'blog': BlogPost,
+    'news': NewsItem,
+    'publications': Publication,
+    'talks': Talk,
+    'teaching': TeachingItem,
+}
+
+
+def repositories(root):
+    return [ContentRepository(str(root / kind), item_class) for kind, item_class in ITEM_CLASSES.items()]
+
+
+def timed_warm_up(root, workers):
+    repos = repositories(root)
+    start = time.perf_counter()
+    rendered = warm_up(repos, workers=workers)
+    elapsed = time.perf_counter() - start
+    loaded = sum(len(repo.list(lang)) for repo in repos for lang in ('en', 'fr', 'bn'))
+    return elapsed, rendered, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=10000, help='number of synthetic files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='process pool size')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_corpus(tmp, args.files)
+        print(f"📄 {args.files} files, {os.cpu_count()} CPUs")
+        print("=" * 60)
+
+        serial, rendered, loaded = timed_warm_up(root, workers=1)
+        print(f"{'serial':<20} {serial:8.2f} s  ({rendered} rendered, {loaded} listed)")
+        parallel, rendered, loaded = timed_warm_up(root, workers=args.workers)
+        print(f"{f'{args.workers} workers':<20} {parallel:8.2f} s  ({rendered} rendered, {loaded} listed)"
+              f"  {serial / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Multi-worker memory benchmark
+=============================
+
+Starts `uvicorn main:app --workers N` over a synthetic corpus, with and
+without the shared content file (SHARED_CONTENT), requests a sample of
+detail pages and reports the workers' memory and startup time.
+
+RSS counts every page a worker touches, shared or not; PSS splits
+shared pages between the processes mapping them, so the PSS total is
+what the workers really cost together. Linux only (reads /proc).
+
+    python benchmarks/bench_workers.py --files 5000 --workers 1 4 8
+"""
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / 'benchmarks'))
+
+from synthetic_corpus import CONTENT_TYPES, LANGUAGES, write_corpus  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def site_root(tmp: Path, files: int) -> Path:
+    """A directory main.py can run in: synthetic content plus the real templates and assets"""
+    root = tmp / 'site'
+    write_corpus(root / 'content', files)
+    (root / 'content' / 'notebooks').mkdir()
+    for name in ('static', 'templates', 'locales'):
+        (root / name).symlink_to(REPO / name)
+    return root
+
+
+def memory_kib(pid: int):
+    """(RSS, PSS) of a process in KiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def worker_pids(parent: int):
+    """Server processes: the spawned workers, or the parent itself when it serves alone"""
+    children = []
+    for stat in Path('/proc').glob('[0-9]*/stat'):
+        try:
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+            cmdline = (stat.parent / 'cmdline').read_bytes()
+        except OSError:
+            continue
+        if int(fields[1]) == parent and b'spawn_main' in cmdline:
+            children.append(int(stat.parent.name))
+    return children or [parent]
+
+
+MODES = {
+    'private': 'every worker parses all content',
+    'build': 'shared file built by the first worker',
+    'mapped': 'shared file already built',
+}
+
+
+def run(root: Path, workers: int, mode: str, requests: int, files: int):
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=str(REPO), CONTENT_CACHE='0')
+    env.pop('SHARED_CONTENT', None)
+    if mode != 'private':
+        shared_path = root / '.cache' / 'shared-content.bin'
+        if mode == 'build' and shared_path.exists():
+            shared_path.unlink()
+        env['SHARED_CONTENT'] = str(shared_path)
+
+    log_path = root / 'server.log'
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--workers', str(workers),
+             '--no-access-log'],
+            cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        # Every worker reports its startup, and the socket must accept connections
+        while log_path.read_text().count('Application startup complete') < workers:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}:\n{log_path.read_text()}")
+            time.sleep(0.05)
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port)).close()
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+        startup = time.perf_counter() - start
+
+        rng = random.Random(0)
+        for _ in range(requests):
+            index = rng.randrange(files)
+            kind, lang = CONTENT_TYPES[index % len(CONTENT_TYPES)], LANGUAGES[index % len(LANGUAGES)]
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/{lang}/{kind}/{kind}-{index:05d}").read()
+
+        usage = [memory_kib(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+    rss = sum(r for r, _ in usage) / 1024
+    pss = sum(p for _, p in usage) / 1024
+    return startup, rss, pss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=5000, help='number of synthetic files')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='worker counts to compare')
+    parser.add_argument('--requests', type=int, default=2000, help='detail pages requested per run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = site_root(Path(tmp), args.files)
+        print(f"📄 {args.files} files, {os.cpu_count()} CPUs, {args.requests} requests per run")
+        for mode, description in MODES.items():
+            print(f"   {mode:<8} {description}")
+        print("=" * 72)
+        print(f"{'workers':>7}  {'mode':<8} {'startup':>9} {'RSS total':>11} {'PSS total':>11} {'PSS/worker':>11}")
+        for workers in args.workers:
+            for mode in MODES:
+                startup, rss, pss = run(root, workers, mode, args.requests, args.files)
+                print(f"{workers:>7}  {mode:<8} {startup:>8.1f}s "
+                      f"{rss:>9.1f} MB {pss:>9.1f} MB {pss / workers:>9.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Synthetic Content Corpus
+========================
+
+Writes a large, reproducible set of markdown content files for the
+benchmarks. Files follow the same frontmatter conventions as `content/`.
+"""
+
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+LANGUAGES = ['en', 'fr', 'bn']
+
+TAGS = [
+    'zebrafish', 'neuroscience', 'vestibular system', 'locomotion', 'biomechanics',
+    'posture', 'imaging', 'light-sheet', 'modeling', 'teaching', 'python',
+    'data analysis', 'behaviour', 'cerebellum', 'development', 'outreach',
+]
+
+WORDS = {
+    'en': ('brain neuron signal posture balance larva swim vestibular circuit '
+           'response model data analysis experiment fish light microscope').split(),
+    'fr': ('cerveau neurone signal posture équilibre larve nage vestibulaire circuit '
+           'réponse modèle données analyse expérience poisson lumière microscope').split(),
+    'bn': ('মস্তিষ্ক নিউরন সংকেত ভঙ্গি ভারসাম্য লার্ভা সাঁতার ভেস্টিবুলার সার্কিট '
+           'প্রতিক্রিয়া মডেল তথ্য বিশ্লেষণ পরীক্ষা মাছ আলো অণুবীক্ষণ').split(),
+}
+
+CONTENT_TYPES = ['blog', 'news', 'publications', 'talks', 'teaching']
+
+
+def _sentence(rng, lang, length=12):
+    words = [rng.choice(WORDS[lang]) for _ in range(length)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _body(rng, lang, paragraphs):
+    parts = [f"# {_sentence(rng, lang, 5)[:-1]}"]
+    for index in range(paragraphs):
+        parts.append(' '.join(_sentence(rng, lang) for _ in range(4)))
+        if index % 3 == 1:
+            parts.append("```python\nimport numpy as np\nx = np.linspace(0, 1, 100)\nprint(x.mean())\n```")
+        if index % 4 == 2:
+            parts.append("| angle | response |\n|-------|----------|\n| 10 | 0.4 |\n| 20 | 0.9 |")
+    return '\n\n'.join(parts)
+
+
+def _frontmatter(rng, kind, index, lang, day):
+    tags = rng.sample(TAGS, rng.randint(1, 4))
+    lines = [
+        f'title: "{_sentence(rng, lang, 6)[:-1]} {index}"',
+        f'date: {day.isoformat()}',
+        f'lang: "{lang}"',
+        'tags: [' + ', '.join(f'"{tag}"' for tag in tags) + ']',
+    ]
+    if kind == 'blog':
+        lines.append('author: "Sharbatanu Chatterjee"')
+        lines.append(f'excerpt: "{_sentence(rng, lang)}"')
+    elif kind == 'news':
+        lines.append(f'category: "{rng.choice(["general", "research", "career"])}"')
+        lines.append(f'importance: "{rng.choice(["high", "normal", "low"])}"')
+    elif kind == 'publications':
+        authors = ', '.join(f'"Author {rng.randint(1, 200)}"' for _ in range(rng.randint(1, 5)))
+        lines.append(f'authors: [{authors}]')
+        lines.append(f'journal: "{rng.choice(["eLife", "bioRxiv", "Current Biology", "J Neurosci"])}"')
+        lines.append(f'type: "{rng.choice(["journal", "conference", "preprint"])}"')
+        # Every other publication uses a block scalar, like the real ones do
+        if index % 2:
+            lines.append('abstract: |\n ' + _sentence(rng, lang, 40))
+    elif kind == 'talks':
+        lines.append(f'venue: "{rng.choice(["SfN", "FENS", "Cosyne"])}"')
+        lines.append(f'type: "{rng.choice(["invited", "contributed", "poster"])}"')
+        lines.append(f'abstract: "{_sentence(rng, lang, 30)}"')
+    elif kind == 'teaching':
+        lines.append('institution: "Institut de Neurosciences Paris-Saclay"')
+        lines.append(f'role: "{rng.choice(["instructor", "TA", "guest lecturer"])}"')
+    return '---\n' + '\n'.join(lines) + '\n---\n\n'
+
+
+def write_corpus(root, count: int, seed: int = 0, paragraphs: int = 6) -> Path:
+    """Write `count` files spread over content/<type>/ directories under root"""
+    rng = random.Random(seed)
+    root = Path(root)
+    start = date(2010, 1, 1)
+    for kind in CONTENT_TYPES:
+        (root / kind).mkdir(parents=True, exist_ok=True)
+
+    for index in range(count):
+        kind = CONTENT_TYPES[index % len(CONTENT_TYPES)]
+        lang = LANGUAGES[index % len(LANGUAGES)]
+        day = start + timedelta(days=rng.randint(0, 5000))
+        text = _frontmatter(rng, kind, index, lang, day) + _body(rng, lang, paragraphs) + '\n'
+        (root / kind / f"{kind}-{index:05d}.md").write_text(text, encoding='utf-8')
+    return root
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Compiled Content Cache
+======================
+
+Persistent on-disk cache of parsed content files (metadata, markdown
+body and rendered HTML), so a restart with unchanged content skips
+YAML parsing and markdown rendering entirely.
+
+Entries are keyed by the file's content hash, the item type, its
+markdown extension set and excerpt policy, and the versions of the
+libraries that shape the output, so a library upgrade or a rendering
+settings change invalidates them.
+
+Usage:
+    python content_cache.py stats
+    python content_cache.py prune    # drop entries no current file maps to
+    python content_cache.py clear
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import markdown
+import yaml
+
+from atomic_file import atomic_write
+
+try:
+    import pygments
+    PYGMENTS_VERSION = pygments.__version__
+except ImportError:
+    PYGMENTS_VERSION = ''
+
+DEFAULT_CACHE_DIR = '.cache/content'
+
+# Bump when the record layout changes
+FORMAT_VERSION = 2
+
+LIBRARY_VERSIONS = f"markdown={markdown.__version__};pyyaml={yaml.__version__};pygments={PYGMENTS_VERSION}"
+
+
+def render_settings(item_class) -> str:
+    """The settings of an item class that shape its rendered records"""
+    extensions = ','.join(getattr(item_class, 'MARKDOWN_EXTENSIONS', []))
+    return f"{extensions};{getattr(item_class, 'EXCERPT_POLICY', None)!r}"
+
+
+class ContentCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(data: bytes, item_class) -> str:
+        """Key for a content file's bytes rendered by a given item class"""
+        digest = hashlib.sha256()
+        digest.update(f"v{FORMAT_VERSION};{item_class.__module__}.{item_class.__name__};".encode())
+        digest.update(render_settings(item_class).encode())
+        digest.update(LIBRARY_VERSIONS.encode())
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The cached record for a key, or None"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                record = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable cache entry {key}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict):
+        """Store a record; written atomically so readers never see partial data"""
+        try:
+            atomic_write(self._path(key), pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            # Not cached is only a miss on the next start; the record itself is fine
+            print(f"⚠️  Could not write cache entry {key}: {e}")
+
+    def entries(self) -> Iterable[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return self.cache_dir.glob('*/*.pickle')
+
+    def prune(self, live_keys: Iterable[str]) -> int:
+        """Delete entries whose key is not in live_keys; returns the number removed"""
+        live_keys = set(live_keys)
+        removed = 0
+        for path in list(self.entries()):
+            if path.stem not in live_keys:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.prune(())
+
+    def stats(self) -> Dict[str, int]:
+        sizes = [path.stat().st_size for path in self.entries()]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+        }
+
+    def report(self) -> str:
+        """One-line hit-rate summary, printed at startup"""
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return f"📦 Content cache: {self.hits}/{lookups} hits ({rate:.0f}%) in {self.cache_dir}"
+
+
+def _content_managers():
+    """The managers main.py serves, without importing the FastAPI app"""
+    from blog_manager import BlogManager
+    from news_manager import NewsManager
+    from publications_manager import PublicationsManager
+    from talks_manager import TalksManager
+    from teaching_manager import TeachingManager
+    return [BlogManager(), NewsManager(), PublicationsManager(), TalksManager(), TeachingManager()]
+
+
+def live_keys() -> set:
+    """Cache keys of every content file currently on disk"""
+    keys = set()
+    for manager in _content_managers():
+        repository = manager.repository
+        for file_path in Path(repository.content_dir).glob(repository.pattern):
+            keys.add(ContentCache.cache_key(file_path.read_bytes(), repository.item_class))
+    return keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the compiled content cache")
+    parser.add_argument('command', choices=['stats', 'prune', 'clear'])
+    parser.add_argument('--cache-dir', default=os.environ.get('CONTENT_CACHE_DIR', DEFAULT_CACHE_DIR))
+    args = parser.parse_args()
+
+    cache = ContentCache(args.cache_dir)
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"📦 {stats['entries']} entries, {stats['bytes'] / 1024:.1f} KiB in {cache.cache_dir}")
+    elif args.command == 'prune':
+        removed = cache.prune(live_keys())
+        print(f"🧹 Removed {removed} stale entries from {cache.cache_dir}")
+    elif args.command == 'clear':
+        removed = cache.clear()
+        print(f"🗑️  Removed {removed} entries from {cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,677 @@
+"""
+Content Repository
+==================
+
+Shared loading and indexing engine behind the markdown content managers
+(blog, news, publications, talks, teaching).
+
+A repository scans one content directory, parses each file once into an
+item object and keeps per-language partitions sorted by date (newest
+first). Files are only re-parsed when their stat signature changes.
+
+Readers see the indexes through an immutable ContentSnapshot: a reload
+builds a new one next to the current one and swaps it in with a single
+assignment, so no reader ever observes a half-built index.
+"""
+
+import heapq
+from bisect import bisect_left
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import markdown
+
+from frontmatter_reader import read_frontmatter
+
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y')
+
+
+def parse_date(value) -> Optional[datetime]:
+    """Normalise a frontmatter date (date, datetime or string) to a datetime, or None"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), date_format)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_tags(value) -> Tuple[str, ...]:
+    """Normalise the `tags` frontmatter field (list or comma-separated string)"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return tuple(tag.strip() for tag in value.split(','))
+    return tuple(value)
+
+
+class ExcerptPolicy:
+    """
+    How listing excerpts are cut from a markdown body.
+
+    length: maximum number of characters kept
+    first_paragraph: cut from the first paragraph only, rather than the
+        whole body
+    boundary: back off to the last sentence end (if past half the length)
+        or word break instead of cutting mid-word
+    """
+
+    def __init__(self, length: int = 200, first_paragraph: bool = False, boundary: bool = True):
+        self.length = length
+        self.first_paragraph = first_paragraph
+        self.boundary = boundary
+
+    def __repr__(self) -> str:
+        # Part of the content cache keys, so a policy change re-renders excerpts
+        return (f"ExcerptPolicy(length={self.length}, first_paragraph={self.first_paragraph}, "
+                f"boundary={self.boundary})")
+
+    def fits(self, content: str) -> bool:
+        """Whether the body is short enough to be its own excerpt"""
+        return not self.first_paragraph and len(content) <= self.length
+
+    def cut(self, content: str) -> str:
+        """The excerpt's markdown source"""
+        text = content.split('\n\n')[0] if self.first_paragraph else content
+        if len(text) <= self.length:
+            return text
+        text = text[:self.length]
+        if not self.boundary:
+            return text + '...'
+
+        last_sentence = text.rfind('.')
+        if last_sentence > self.length * 0.5:
+            return text[:last_sentence + 1]
+        last_space = text.rfind(' ')
+        if last_space > 0:
+            return text[:last_space] + '...'
+        return text
+
+
+class ContentItem:
+    """
+    Base of the markdown content items (blog posts, news, publications,
+    talks, teaching). Subclasses parse the file and add their own fields.
+    """
+    __slots__ = ('filepath', 'lang', 'metadata', '_content', '_html_content', 'date', 'tags', 'slug')
+
+    MARKDOWN_EXTENSIONS: List[str] = []
+    # Frontmatter date assumed when there is none; None means the load time
+    DEFAULT_DATE = None
+
+    def __init__(self, filepath: str, lang: str = 'en'):
+        self.filepath = filepath
+        self.lang = lang
+        self.metadata = {}
+        self.content = ""
+        # Rendered lazily: listing pages never need the body HTML
+        self._html_content = None
+        self._load()
+        self._precompute()
+
+    def _load(self):
+        """Read the frontmatter and markdown body"""
+        self.metadata, self.content = read_frontmatter(self.filepath)
+
+    def _render(self):
+        """Convert the markdown body to HTML"""
+        md = markdown.Markdown(extensions=self.MARKDOWN_EXTENSIONS)
+        self._html_content = md.convert(self.content)
+
+    def _precompute(self):
+        """Derive the values that sorting, filters and templates read repeatedly"""
+        value = self.metadata.get('date', self.DEFAULT_DATE)
+        self.date = parse_date(value)
+        if self.date is None:
+            if value:
+                # Reported and skipped by the loader, rather than dated today
+                raise ValueError(f"unrecognised date {value!r}")
+            self.date = datetime.now()
+        self.tags = parse_tags(self.metadata.get('tags', []))
+        self.slug = self.metadata.get('slug', Path(self.filepath).stem)
+
+    @property
+    def content(self) -> str:
+        # The body and its HTML are str, or views into the shared content
+        # file (shared_content.py) decoded on use
+        return str(self._content)
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+
+    @property
+    def html_content(self) -> str:
+        if self._html_content is None:
+            self._render()
+        return str(self._html_content)
+
+
+def item_to_record(item) -> Dict:
+    """Plain-data form of a parsed item, for the on-disk content cache"""
+    # Render first: blog posts without frontmatter fill metadata while rendering
+    html = item.html_content
+    record = {'metadata': item.metadata, 'content': item.content, 'html': html}
+    if '_excerpt_html' in getattr(type(item), '__slots__', ()):
+        # Items with a rendered excerpt keep it too, so listings never render
+        record['excerpt_html'] = item.excerpt
+    return record
+
+
+def item_from_record(item_class, filepath: str, record: Dict):
+    """Rebuild an item from a cached record without reading or parsing the file"""
+    item = item_class.__new__(item_class)
+    item.filepath = filepath
+    item.lang = 'en'
+    item.metadata = record['metadata']
+    item.content = record['content']
+    item._html_content = record['html']
+    item._precompute()
+    if 'excerpt_html' in record:
+        item._excerpt_html = record['excerpt_html']
+    return item
+
+
+def _render_file(task):
+    """Worker: parse and render one file into a picklable record"""
+    item_class, filepath = task
+    try:
+        return item_to_record(item_class(filepath)), None
+    except Exception as e:
+        return None, str(e)
+
+
+class ContentSnapshot:
+    """
+    Immutable view of a repository's published items and indexes.
+
+    A snapshot is built in full off to the side and published by a single
+    attribute assignment, so a reader holding one always sees matching
+    partitions, keys, slug and tag indexes, and never takes a lock.
+    Sequences are tuples and the dicts are never changed once published;
+    the related-items memo is the one thing filled in later, and readers
+    racing to fill it store the same value.
+    """
+    __slots__ = ('version', 'documents', 'by_lang', 'keys', 'by_slug', 'by_tag', 'tag_names', '_related')
+
+    def __init__(self, files: Optional[Dict[str, tuple]] = None, version: int = 0):
+        """files: filepath -> (file signature, parsed item), as kept by the repository"""
+        # Bumped on every rebuild, so indexes built on top can tell they are stale
+        self.version = version
+        # filepath -> published (non-draft) item, in every language
+        self.documents: Dict[str, object] = {}
+        by_lang: Dict[str, List] = {}
+        for path, (_, item) in (files or {}).items():
+            # Skip drafts
+            if item.metadata.get('draft', False):
+                continue
+            self.documents[path] = item
+            for lang in ContentRepository.item_languages(item.metadata):
+                by_lang.setdefault(lang, []).append(item)
+
+        # lang -> items sorted by (date, slug), newest first
+        self.by_lang: Dict[str, Tuple] = {}
+        # lang -> (date, slug) keys in ascending order (the partition reversed), for bisect
+        self.keys: Dict[str, Tuple[Tuple[datetime, str], ...]] = {}
+        # lang -> slug -> item
+        self.by_slug: Dict[str, Dict[str, object]] = {}
+        # lang -> casefolded tag -> positions in the date-sorted partition
+        self.by_tag: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        # lang -> casefolded tag -> display form (as spelled by the newest item)
+        self.tag_names: Dict[str, Dict[str, str]] = {}
+        for lang, items in by_lang.items():
+            # The slug breaks date ties so the order, and cursors into it, are stable
+            items.sort(key=lambda i: (i.date, i.slug), reverse=True)
+            slugs = self.by_slug[lang] = {}
+            postings: Dict[str, List[int]] = {}
+            names = self.tag_names[lang] = {}
+            for position, item in enumerate(items):
+                # On a slug clash the newest item wins, as with a linear scan
+                slugs.setdefault(item.slug, item)
+                for tag in item.tags:
+                    key = ContentRepository.normalise_tag(tag)
+                    positions = postings.setdefault(key, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+                    names.setdefault(key, tag)
+            self.by_lang[lang] = tuple(items)
+            self.keys[lang] = tuple((item.date, item.slug) for item in reversed(items))
+            self.by_tag[lang] = {key: tuple(positions) for key, positions in postings.items()}
+
+        # lang -> slug -> related items, filled on first request
+        self._related: Dict[str, Dict[str, List]] = {}
+
+    def partition(self, lang: str) -> Tuple:
+        """Items for a language, newest first"""
+        return self.by_lang.get(lang, ())
+
+    def related(self, slug: str, lang: str) -> List:
+        """Best related items for a slug, ranked once per snapshot"""
+        related = self._related.setdefault(lang, {})
+        ranked = related.get(slug)
+        if ranked is None:
+            ranked = related[slug] = self._rank_related(slug, lang)
+        return ranked
+
+    def _rank_related(self, slug: str, lang: str, keep: int = 10) -> List:
+        item = self.by_slug.get(lang, {}).get(slug)
+        if item is None:
+            return []
+
+        tags = {ContentRepository.normalise_tag(tag) for tag in item.tags}
+        postings = self.by_tag.get(lang, {})
+        items = self.partition(lang)
+
+        # Count shared tags per candidate using the inverted index
+        overlap: Dict[int, int] = {}
+        for tag in tags:
+            for position in postings.get(tag, ()):
+                overlap[position] = overlap.get(position, 0) + 1
+
+        scored = []
+        for position, shared in overlap.items():
+            candidate = items[position]
+            if candidate is item or candidate.slug == slug:
+                continue
+            candidate_tags = {ContentRepository.normalise_tag(tag) for tag in candidate.tags}
+            score = shared / len(tags | candidate_tags)
+            # Lower position means newer, so it wins ties
+            scored.append((-score, position))
+
+        return [items[position] for _, position in heapq.nsmallest(keep, scored)]
+
+
+class ContentRepository:
+    def __init__(self, content_dir: str, item_class, pattern: str = '*.md', disk_cache=None):
+        self.content_dir = content_dir
+        self.item_class = item_class
+        self.pattern = pattern
+        # Optional content_cache.ContentCache shared across restarts
+        self.disk_cache = disk_cache
+        # When False, the directory is only rescanned on an explicit refresh()
+        self.auto_refresh = True
+        # filepath -> (file signature, parsed item); only touched by reloads
+        self._files = {}
+        # What readers see; replaced as a whole, never modified
+        self._snapshot = ContentSnapshot()
+        # Serialises reloads; readers never take it
+        self._reload_lock = threading.Lock()
+        self._loaded = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def file_signature(file_path: Path) -> tuple:
+        """Cheap change detector: a file is re-parsed only if one of these moves"""
+        stat = file_path.stat()
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @staticmethod
+    def normalise_tag(tag) -> str:
+        """Key used for tag lookups, so 'Zebrafish' and 'zebrafish' are one tag"""
+        return str(tag).strip().casefold()
+
+    @staticmethod
+    def item_languages(metadata: Dict) -> List[str]:
+        """Normalise the `lang` frontmatter field (string, quoted string or list)"""
+        lang = metadata.get('lang', 'en')
+        if isinstance(lang, (list, tuple)):
+            return [str(l).strip('"\'') for l in lang]
+        return [str(lang).strip('"\'')]
+
+    def _load_item(self, file_path: Path):
+        """Return the parsed item for a file, re-parsing only when it changed on disk"""
+        key = str(file_path)
+        signature = self.file_signature(file_path)
+        cached = self._files.get(key)
+        if cached is not None and cached[0] == signature:
+            self.cache_hits += 1
+            return cached[1], False
+
+        self.cache_misses += 1
+        item = self._parse(file_path)
+        self._install(file_path, signature, item)
+        return item, True
+
+    def _install(self, file_path: Path, signature: tuple, item):
+        item.lang = self.item_languages(item.metadata)[0]
+        self._files[str(file_path)] = (signature, item)
+
+    def _parse(self, file_path: Path):
+        """Parse a file, going through the on-disk cache when there is one"""
+        if self.disk_cache is None:
+            return self.item_class(str(file_path))
+
+        cache_key = self.disk_cache.cache_key(file_path.read_bytes(), self.item_class)
+        record = self.disk_cache.get(cache_key)
+        if record is not None:
+            return item_from_record(self.item_class, str(file_path), record)
+
+        item = self.item_class(str(file_path))
+        self.disk_cache.put(cache_key, item_to_record(item))
+        return item
+
+    def refresh(self) -> bool:
+        """Rescan the content directory; returns True if anything changed"""
+        with self._reload_lock:
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        content_dir = Path(self.content_dir)
+        if not content_dir.exists():
+            changed = bool(self._files)
+            self._files = {}
+            if changed or not self._loaded:
+                self._publish()
+            return changed
+
+        changed = False
+        seen = set()
+        for file_path in content_dir.glob(self.pattern):
+            seen.add(str(file_path))
+            try:
+                _, reloaded = self._load_item(file_path)
+                changed = changed or reloaded
+            except Exception as e:
+                if self._files.pop(str(file_path), None) is not None:
+                    changed = True
+                print(f"Error loading {file_path}: {e}")
+
+        # Forget items whose files were deleted
+        for stale in set(self._files) - seen:
+            del self._files[stale]
+            changed = True
+
+        if changed or not self._loaded:
+            self._publish()
+        return changed
+
+    def apply_changes(self, changed_paths) -> bool:
+        """
+        Re-parse or drop only the given files and patch the indexes.
+
+        Paths outside this repository's directory are ignored, so a file
+        watcher can hand every changed path to every repository.
+        """
+        with self._reload_lock:
+            return self._apply_changes(changed_paths)
+
+    def _apply_changes(self, changed_paths) -> bool:
+        content_dir = Path(self.content_dir).resolve()
+        changed = False
+        for path in map(Path, changed_paths):
+            if path.resolve().parent != content_dir or not path.match(self.pattern):
+                continue
+            # Same key form as the directory scan in refresh()
+            file_path = Path(self.content_dir) / path.name
+            key = str(file_path)
+            if not file_path.exists():
+                if self._files.pop(key, None) is not None:
+                    changed = True
+                continue
+            try:
+                _, reloaded = self._load_item(file_path)
+                changed = changed or reloaded
+            except Exception as e:
+                if self._files.pop(key, None) is not None:
+                    changed = True
+                print(f"Error loading {file_path}: {e}")
+
+        if changed:
+            self._publish()
+        return changed
+
+    def loaded_items(self) -> List[Tuple[str, tuple, object]]:
+        """(filepath, file signature, item) of every loaded file, drafts included"""
+        self._ensure_fresh()
+        # Copied under the lock: a reload in another thread changes the dict in place
+        with self._reload_lock:
+            return [(path, signature, item) for path, (signature, item) in self._files.items()]
+
+    def adopt(self, entries) -> int:
+        """
+        Install items parsed elsewhere, given as (filepath, file signature,
+        item), and publish them. Files that changed since are re-parsed by
+        the next refresh as usual. Returns the number of items installed.
+        """
+        with self._reload_lock:
+            count = 0
+            for filepath, signature, item in entries:
+                self._install(Path(filepath), signature, item)
+                count += 1
+            self._publish()
+        return count
+
+    def _publish(self):
+        """Build a snapshot of the current files and swap it in; callers hold the reload lock"""
+        self._snapshot = ContentSnapshot(self._files, self._snapshot.version + 1)
+        self._loaded = True
+
+    def _ensure_fresh(self):
+        if not self._loaded:
+            self.refresh()
+        elif self.auto_refresh and self._reload_lock.acquire(blocking=False):
+            # While another request is rescanning, serve the current snapshot
+            try:
+                self._refresh()
+            finally:
+                self._reload_lock.release()
+
+    @property
+    def snapshot(self) -> ContentSnapshot:
+        """
+        The current snapshot, brought up to date first.
+
+        Take it once and read everything from it to get a consistent view
+        across several lookups.
+        """
+        self._ensure_fresh()
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot, for cache keys and logs"""
+        return self.snapshot.version
+
+    def documents(self) -> Dict[str, object]:
+        """Published (non-draft) items in every language, keyed by file path"""
+        return dict(self.snapshot.documents)
+
+    def list(self, lang: str = 'en', limit: Optional[int] = None) -> List:
+        """All items for a language, sorted by date (newest first)"""
+        items = self.snapshot.partition(lang)
+        if limit:
+            return list(items[:limit])
+        return list(items)
+
+    def get(self, slug: str, lang: str = 'en'):
+        """A specific item by slug"""
+        return self.snapshot.by_slug.get(lang, {}).get(slug)
+
+    def by_tag(self, tag: str, lang: str = 'en') -> List:
+        """Items carrying a tag (case-insensitive), newest first"""
+        snapshot = self.snapshot
+        items = snapshot.partition(lang)
+        positions = snapshot.by_tag.get(lang, {}).get(self.normalise_tag(tag), ())
+        return [items[position] for position in positions]
+
+    def tags(self, lang: str = 'en') -> List[str]:
+        """All unique tags for a language"""
+        return sorted(self.snapshot.tag_names.get(lang, {}).values(), key=str.casefold)
+
+    def tag_counts(self, lang: str = 'en') -> Dict[str, int]:
+        """Number of items per tag, for tag clouds"""
+        snapshot = self.snapshot
+        names = snapshot.tag_names.get(lang, {})
+        postings = snapshot.by_tag.get(lang, {})
+        return {names[key]: len(postings[key])
+                for key in sorted(names, key=lambda key: names[key].casefold())}
+
+    def related(self, slug: str, lang: str = 'en', limit: int = 3) -> List:
+        """
+        Items sharing the most tags with the given one, best first.
+
+        Scored by Jaccard similarity of the case-folded tag sets, ties
+        broken by date. The ranking is computed once per item and
+        snapshot, then served from memory.
+        """
+        return self.snapshot.related(slug, lang)[:limit]
+
+    @staticmethod
+    def cursor_for(item) -> str:
+        """Pagination cursor pointing at an item: its date and slug"""
+        return f"{item.date.isoformat()}~{item.slug}"
+
+    @staticmethod
+    def parse_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+        """The (date, slug) key of a cursor, or None if it is malformed"""
+        date_part, separator, slug = cursor.partition('~')
+        if not separator or not slug:
+            return None
+        try:
+            return datetime.fromisoformat(date_part), slug
+        except ValueError:
+            return None
+
+    def paginate(self, lang: str = 'en', per_page: int = 10, page: int = 1,
+                 cursor: Optional[str] = None) -> Dict:
+        """
+        One page of a language partition, newest first.
+
+        With a cursor (a previous page's next_cursor) the page starts right
+        after that (date, slug) key, found by bisect, so the link keeps
+        pointing at the same place while newer items are published.
+        Otherwise `page` (1-based) is an offset into the partition.
+
+        Returns items, page, pages, total, has_prev, next_cursor and
+        prev_cursor; prev_cursor is None when the previous page is the
+        first one. Raises ValueError for a malformed cursor.
+        """
+        snapshot = self.snapshot
+        items = snapshot.partition(lang)
+        total = len(items)
+        if cursor is not None:
+            key = self.parse_cursor(cursor)
+            if key is None:
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            start = total - bisect_left(snapshot.keys.get(lang, ()), key)
+        else:
+            start = (max(page, 1) - 1) * per_page
+        end = start + per_page
+        # Last item before the previous page, whose cursor opens that page
+        before_prev = start - per_page - 1
+
+        return {
+            'items': list(items[start:end]),
+            'page': start // per_page + 1,
+            'pages': max(1, -(-total // per_page)),
+            'total': total,
+            'has_prev': start > 0,
+            'next_cursor': self.cursor_for(items[end - 1]) if end < total else None,
+            'prev_cursor': self.cursor_for(items[before_prev]) if 0 <= before_prev < total else None,
+        }
+
+    def since(self, cutoff: datetime, lang: str = 'en', limit: Optional[int] = None) -> List:
+        """Items dated on or after `cutoff`, newest first, found by bisecting the partition"""
+        snapshot = self.snapshot
+        keys = snapshot.keys.get(lang, ())
+        count = len(keys) - bisect_left(keys, (cutoff,))
+        if limit:
+            count = min(count, limit)
+        return list(snapshot.partition(lang)[:count])
+
+    def recent(self, lang: str = 'en', days: Optional[int] = None, limit: Optional[int] = None) -> List:
+        """Newest items, optionally restricted to the last `days` days"""
+        if days is not None:
+            return self.since(datetime.now() - timedelta(days=days), lang, limit)
+        return self.list(lang, limit)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the parsed-item cache"""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'entries': len(self._files),
+        }
+
+
+def warm_up(repositories: List[ContentRepository], workers: Optional[int] = None) -> int:
+    """
+    Load every repository up front, parsing and rendering the files that
+    are neither loaded nor in the on-disk cache across a process pool.
+
+    workers=None uses one process per CPU; workers=1 renders in-process.
+    Returns the number of files that had to be rendered.
+    """
+    # (repository, file path, signature, disk cache key) for each file to render
+    jobs = []
+    # (repository, file path, signature, item) for each file loaded, installed
+    # together under the reload lock at the end
+    loaded_files = []
+    for repository in repositories:
+        content_dir = Path(repository.content_dir)
+        if not content_dir.exists():
+            continue
+        with repository._reload_lock:
+            current = dict(repository._files)
+        for file_path in content_dir.glob(repository.pattern):
+            try:
+                signature = repository.file_signature(file_path)
+                cached = current.get(str(file_path))
+                if cached is not None and cached[0] == signature:
+                    continue
+
+                cache_key = None
+                if repository.disk_cache is not None:
+                    cache_key = repository.disk_cache.cache_key(file_path.read_bytes(), repository.item_class)
+                    record = repository.disk_cache.get(cache_key)
+                    if record is not None:
+                        item = item_from_record(repository.item_class, str(file_path), record)
+                        loaded_files.append((repository, file_path, signature, item))
+                        continue
+                jobs.append((repository, file_path, signature, cache_key))
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+
+    tasks = [(repository.item_class, str(file_path)) for repository, file_path, _, _ in jobs]
+    if workers == 1 or len(tasks) <= 1:
+        results = [_render_file(task) for task in tasks]
+    else:
+        processes = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunksize = max(1, len(tasks) // (processes * 4))
+            results = list(pool.map(_render_file, tasks, chunksize=chunksize))
+
+    for (repository, file_path, signature, cache_key), (record, error) in zip(jobs, results):
+        if record is None:
+            print(f"Error loading {file_path}: {error}")
+            continue
+        repository.cache_misses += 1
+        loaded_files.append((repository, file_path, signature,
+                             item_from_record(repository.item_class, str(file_path), record)))
+        if cache_key is not None:
+            repository.disk_cache.put(cache_key, record)
+
+    for repository in repositories:
+        # Picks up anything that failed above, drops deleted files and
+        # publishes the items loaded above
+        with repository._reload_lock:
+            for owner, file_path, signature, item in loaded_files:
+                if owner is repository:
+                    repository._install(file_path, signature, item)
+            loaded = repository._loaded
+            # A first load publishes on its own
+            if not repository._refresh() and loaded:
+                repository._publish()
+    return len(tasks)
@@ -0,0 +1,183 @@
+"""
+Content Watcher
+===============
+
+Optional background task that watches `content/` and `locales/` with
+watchfiles and patches the in-memory content indexes as files change.
+
+While the watcher runs, the repositories stop rescanning their
+directories on every request: readers hit the warm indexes and only the
+files reported by the watcher are re-parsed.
+
+Servers without the watcher use ContentPoller instead, which rescans
+every few seconds in a worker thread, so requests never scan either.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+try:
+    from watchfiles import awatch
+except ImportError:  # watchfiles is a development dependency
+    awatch = None
+
+from content_repository import ContentRepository
+
+
+class ContentWatcher:
+    def __init__(self, repositories: List[ContentRepository], notebook_manager=None,
+                 on_locale_change: Optional[Callable[[Path], None]] = None,
+                 watch_dirs: Iterable[str] = ('content', 'locales'),
+                 debounce_ms: int = 200, on_refresh: Optional[Callable[[], None]] = None):
+        """on_refresh runs after a batch of changes reloads any repository, in the same thread"""
+        self.repositories = repositories
+        self.notebook_manager = notebook_manager
+        self.on_locale_change = on_locale_change
+        self.on_refresh = on_refresh
+        self.watch_dirs = list(watch_dirs)
+        self.debounce_ms = debounce_ms
+        self._task = None
+        self._stop_event = None
+
+    def start(self) -> bool:
+        """Start watching the loaded content; returns False if watching is unavailable"""
+        if awatch is None:
+            print("⚠️  watchfiles is not installed, content watching disabled")
+            return False
+
+        watch_dirs = [d for d in self.watch_dirs if Path(d).exists()]
+        if not watch_dirs:
+            return False
+
+        # Repositories not loaded yet load on first read
+        for repository in self.repositories:
+            repository.auto_refresh = False
+        if self.notebook_manager is not None:
+            self.notebook_manager.refresh()
+            self.notebook_manager.auto_refresh = False
+
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(watch_dirs))
+        print(f"👀 Watching {', '.join(watch_dirs)} for content changes")
+        return True
+
+    async def stop(self):
+        """Stop watching and fall back to rescanning on every request"""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        await self._task
+        self._task = None
+
+        for repository in self.repositories:
+            repository.auto_refresh = True
+        if self.notebook_manager is not None:
+            self.notebook_manager.auto_refresh = True
+
+    async def _run(self, watch_dirs: List[str]):
+        async for changes in awatch(*watch_dirs, stop_event=self._stop_event,
+                                    debounce=self.debounce_ms, step=50):
+            # Re-parsing runs in a thread so requests are served meanwhile
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.apply, {path for _, path in changes})
+
+    def apply(self, changed_paths: Iterable[str]):
+        """Route changed paths to the repositories, the notebook index and the locales"""
+        changed_paths = [Path(path) for path in changed_paths]
+
+        reloaded = False
+        for repository in self.repositories:
+            try:
+                if repository.apply_changes(changed_paths):
+                    reloaded = True
+                    print(f"🔄 Reloaded {repository.content_dir} (version {repository.version})")
+            except Exception as e:
+                print(f"Error updating {repository.content_dir}: {e}")
+
+        if reloaded and self.on_refresh is not None:
+            try:
+                self.on_refresh()
+            except Exception as e:
+                print(f"Error after content refresh: {e}")
+
+        if self.notebook_manager is not None and any(p.suffix == '.ipynb' for p in changed_paths):
+            try:
+                self.notebook_manager.refresh()
+            except Exception as e:
+                print(f"Error updating notebooks: {e}")
+
+        if self.on_locale_change is not None:
+            for path in changed_paths:
+                if path.suffix == '.yml' and path.parent.name == 'locales':
+                    try:
+                        self.on_locale_change(path)
+                    except Exception as e:
+                        print(f"Error reloading translations from {path}: {e}")
+
+
+class ContentPoller:
+    def __init__(self, repositories: List[ContentRepository], notebook_manager=None,
+                 interval: float = 10.0, on_refresh: Optional[Callable[[], None]] = None):
+        """
+        Rescan every `interval` seconds, off the event loop; on_refresh runs
+        after each rescan, in the same thread. interval=0 never rescans, so
+        content is only reloaded by an explicit refresh().
+        """
+        self.repositories = repositories
+        self.notebook_manager = notebook_manager
+        self.interval = interval
+        self.on_refresh = on_refresh
+        self._task = None
+        self._stop_event = None
+
+    def start(self):
+        """Stop the per-request rescans and start polling"""
+        # The repositories are loaded already (or load on first read), so
+        # the first rescan waits for the first interval
+        for repository in self.repositories:
+            repository.auto_refresh = False
+        if self.notebook_manager is not None:
+            self.notebook_manager.refresh()
+            self.notebook_manager.auto_refresh = False
+
+        if self.interval > 0:
+            self._stop_event = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._stop_event.set()
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await loop.run_in_executor(None, self.poll)
+
+    def poll(self):
+        """Rescan everything once"""
+        for repository in self.repositories:
+            try:
+                if repository.refresh():
+                    print(f"🔄 Reloaded {repository.content_dir} (version {repository.version})")
+            except Exception as e:
+                print(f"Error updating {repository.content_dir}: {e}")
+
+        if self.notebook_manager is not None:
+            try:
+                self.notebook_manager.refresh()
+            except Exception as e:
+                print(f"Error updating notebooks: {e}")
+
+        if self.on_refresh is not None:
+            try:
+                self.on_refresh()
+            except Exception as e:
+                print(f"Error after content refresh: {e}")
@@ -0,0 +1,119 @@
+"""
+Facet Index
+===========
+
+Bitset index for combined filters over a date-sorted list of items.
+
+Every facet value (a year, a type, a tag, an author) maps to a Python
+int used as a bitset: bit i is set when item i carries the value. A
+query ORs the bitsets of the values selected within a facet and ANDs
+the facets together, so any combination of filters costs a handful of
+big-int operations instead of a pass over the items. Facet counts are
+computed the same way, each facet against the filters of the others.
+"""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+def popcount(bits: int) -> int:
+    # int.bit_count() needs Python 3.10
+    return bin(bits).count('1')
+
+
+def normalise_value(value):
+    """Facet values match case-insensitively; numbers (years) are kept as they are"""
+    return value.strip().casefold() if isinstance(value, str) else value
+
+
+class FacetIndex:
+    def __init__(self, items: List, facets: Dict[str, Callable[[object], Iterable]]):
+        """
+        items: the items in display order (newest first)
+        facets: facet name -> function returning an item's values for it
+        """
+        self.items = items
+        self.all = (1 << len(items)) - 1
+        # facet -> normalised value -> bitset of item positions
+        self.bitsets: Dict[str, Dict[object, int]] = {facet: {} for facet in facets}
+        # facet -> normalised value -> display form (as spelled by the newest item)
+        self.names: Dict[str, Dict[object, object]] = {facet: {} for facet in facets}
+
+        for facet, values_of in facets.items():
+            positions: Dict[object, List[int]] = {}
+            names = self.names[facet]
+            for position, item in enumerate(items):
+                for value in values_of(item):
+                    key = normalise_value(value)
+                    positions.setdefault(key, []).append(position)
+                    names.setdefault(key, value)
+            self.bitsets[facet] = {key: sum(1 << position for position in set(found))
+                                   for key, found in positions.items()}
+        # Unfiltered counts, served whenever no other facet is filtered
+        self.totals: Dict[str, Dict[object, int]] = {
+            facet: {self.names[facet][key]: popcount(bits) for key, bits in bitsets.items()}
+            for facet, bitsets in self.bitsets.items()
+        }
+
+    def values(self, facet: str) -> List:
+        """Display forms of a facet's values"""
+        return list(self.names[facet].values())
+
+    def mask(self, facet: str, values: Iterable) -> int:
+        """Items carrying any of the given values of one facet"""
+        bitsets = self.bitsets[facet]
+        bits = 0
+        for value in values:
+            bits |= bitsets.get(normalise_value(value), 0)
+        return bits
+
+    def select(self, bits: int) -> List:
+        """Items whose bits are set, in display order"""
+        if bits == self.all:
+            return list(self.items)
+        # Reading the binary string once is linear; peeling off the lowest
+        # bit one at a time would copy the big int per item
+        digits = bin(bits)[:1:-1]
+        items = []
+        position = digits.find('1')
+        while position != -1:
+            items.append(self.items[position])
+            position = digits.find('1', position + 1)
+        return items
+
+    def query(self, filters: Dict[str, Iterable]) -> Tuple[List, Dict[str, Dict[object, int]]]:
+        """
+        Items matching every facet filter, and the facet counts.
+
+        filters maps a facet to the values to accept (any of them); facets
+        missing from it, or given no values, do not filter. The count of a
+        value is the number of items it would match together with the
+        filters on the other facets, so selecting it never yields nothing.
+        """
+        masks = {}
+        for facet, values in filters.items():
+            values = list(values or ())
+            if values:
+                masks[facet] = self.mask(facet, values)
+
+        selected = self.all
+        for bits in masks.values():
+            selected &= bits
+
+        counts: Dict[str, Dict[object, int]] = {}
+        for facet, bitsets in self.bitsets.items():
+            others = self.all
+            for other, bits in masks.items():
+                if other != facet:
+                    others &= bits
+            if others == self.all:
+                counts[facet] = dict(self.totals[facet])
+                continue
+            names = self.names[facet]
+            facet_counts = {}
+            for key, bits in bitsets.items():
+                count = popcount(bits & others)
+                if count:
+                    facet_counts[names[key]] = count
+            counts[facet] = facet_counts
+
+        return self.select(selected), counts
@@ -0,0 +1,121 @@
+"""
+Frontmatter Reader
+==================
+
+Reads the YAML frontmatter block of markdown content files.
+
+The header is read line by line and reading stops at the closing `---`
+line, so callers that only need metadata never touch the body. Flat
+`key: value` headers (the common case) are parsed by a small fast path;
+anything else goes to PyYAML, using the libyaml `CSafeLoader` when it
+is available.
+"""
+
+import re
+from datetime import date
+from typing import Dict, Tuple
+
+import yaml
+
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DELIMITER = '---'
+
+_KEY_VALUE = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):[ \t]+(.+?)[ \t]*$')
+_DOUBLE_QUOTED = re.compile(r'^"([^"\\]*)"$')
+_SINGLE_QUOTED = re.compile(r"^'([^']*)'$")
+_DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+_INT = re.compile(r'^-?(?:0|[1-9][0-9]*)$')
+_QUOTED_LIST = re.compile(r'^\[\s*(?:"[^"\\]*"\s*(?:,\s*"[^"\\]*"\s*)*)?\]$')
+_QUOTED_LIST_ITEM = re.compile(r'"([^"\\]*)"')
+_PLAIN = re.compile(r'^[A-Za-z][A-Za-z0-9 _./-]*$')
+
+# Plain words that YAML 1.1 resolves to something other than a string
+_BOOLEANS = {
+    'true': True, 'True': True, 'TRUE': True,
+    'false': False, 'False': False, 'FALSE': False,
+}
+_NON_STRING_WORDS = {
+    'yes', 'Yes', 'YES', 'no', 'No', 'NO',
+    'on', 'On', 'ON', 'off', 'Off', 'OFF',
+    'null', 'Null', 'NULL',
+}
+
+# Keys that YAML would not load as plain strings
+_RESERVED_KEYS = set(_BOOLEANS) | _NON_STRING_WORDS
+
+_NO_VALUE = object()
+
+
+def _parse_scalar(value: str):
+    """Parse a value the way yaml.safe_load would, or return _NO_VALUE if unsure"""
+    match = _DOUBLE_QUOTED.match(value) or _SINGLE_QUOTED.match(value)
+    if match:
+        return match.group(1)
+    if value in _BOOLEANS:
+        return _BOOLEANS[value]
+    match = _DATE.match(value)
+    if match:
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            return _NO_VALUE
+    if _INT.match(value):
+        return int(value)
+    if _QUOTED_LIST.match(value):
+        return _QUOTED_LIST_ITEM.findall(value)
+    if _PLAIN.match(value) and value not in _NON_STRING_WORDS:
+        return value
+    return _NO_VALUE
+
+
+def parse_header(header: str) -> Dict:
+    """Parse a frontmatter block, taking the fast path for flat key: value lines"""
+    metadata = {}
+    for line in header.splitlines():
+        if not line.strip():
+            continue
+        match = _KEY_VALUE.match(line)
+        value = _parse_scalar(match.group(2)) if match else _NO_VALUE
+        if value is _NO_VALUE or match.group(1) in metadata or match.group(1) in _RESERVED_KEYS:
+            break
+        metadata[match.group(1)] = value
+    else:
+        return metadata
+
+    metadata = yaml.load(header, Loader=YamlLoader)
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def read_frontmatter(filepath, with_body: bool = True) -> Tuple[Dict, str]:
+    """
+    Read a content file's frontmatter and, optionally, its body.
+
+    Returns (metadata, body). Files without a frontmatter block give an
+    empty dict and the whole file as body. With with_body=False reading
+    stops at the closing delimiter and the body is returned as ''.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if first_line.rstrip() != DELIMITER:
+            return {}, (first_line + f.read()) if with_body else ''
+
+        header_lines = []
+        closed = False
+        line = f.readline()
+        while line:
+            if line.rstrip() == DELIMITER:
+                closed = True
+                break
+            header_lines.append(line)
+            line = f.readline()
+
+        if not closed:
+            # No closing delimiter: treat the whole file as body
+            if not with_body:
+                return {}, ''
+            return {}, first_line + ''.join(header_lines)
+
+        metadata = parse_header(''.join(header_lines))
+        body = f.read().strip() if with_body else ''
+    return metadata, body
@@ -9,17 +9,20 @@ deployed to GitHub Pages or any static hosting service.
 Author: Sharbatanu Chatterjee
 """
 
+import json
 import os
+import re
 import sys
 import shutil
-import yaml
 import requests
 import time
 import signal
 import subprocess
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
-import threading
+from urllib.parse import urljoin
+
+from frontmatter_reader import read_frontmatter
+from notebook_assets import DEFAULT_ASSETS_DIR as NOTEBOOK_ASSETS_DIR
 
 class StaticSiteGenerator:
     def __init__(self, base_url="http://localhost:8000", output_dir="dist", production_url="https://sharbat.ch/"):
@@ -52,6 +55,9 @@ class StaticSiteGenerator:
             "/en/news",
             "/fr/news",
             "/bn/news",
+            "/en/search",
+            "/fr/search",
+            "/bn/search",
         ]
     
     def start_server(self):
@@ -68,7 +74,10 @@ class StaticSiteGenerator:
                 "--host", "0.0.0.0", 
                 "--port", "8000",
                 "--log-level", "warning"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                # Static hosting has no cells endpoint to load long notebooks from,
+                # and serves the same page whatever the facet filters' query string
+                env=dict(os.environ, NOTEBOOK_PAGE_CELLS="0", PUBLICATION_FACETS="0"))
             
             # Wait for server to start
             time.sleep(10)
@@ -118,11 +127,24 @@ class StaticSiteGenerator:
             shutil.copytree(files_dir, output_files)
             print("✅ Copied files directory (downloads)")
     
+    def copy_notebook_assets(self):
+        """Copy the notebook images written during page generation"""
+        assets_dir = Path(NOTEBOOK_ASSETS_DIR)
+        if assets_dir.exists():
+            shutil.copytree(assets_dir, self.output_dir / NOTEBOOK_ASSETS_DIR, dirs_exist_ok=True)
+            print(f"✅ Copied {sum(1 for _ in assets_dir.iterdir())} notebook images")
+    
     def generate_page(self, page_path):
         """Generate a single page, post-process for correct static asset and meta tags"""
         try:
             url = urljoin(self.base_url, page_path)
             response = requests.get(url, timeout=10)
+            # Notebooks still being converted answer 503 with a Retry-After delay
+            for _ in range(12):
+                if response.status_code != 503:
+                    break
+                time.sleep(int(response.headers.get('Retry-After', 5)))
+                response = requests.get(url, timeout=10)
             if response.status_code == 200:
                 # Create directory structure
                 if page_path.endswith('/') or '.' not in page_path.split('/')[-1]:
@@ -143,6 +165,10 @@ class StaticSiteGenerator:
                 with open(file_path, 'w', encoding='utf-8') as f:
                     f.write(html)
                 print(f"✅ Generated: {page_path} -> {file_path}")
+                # Queue the next page of paginated listings (/{lang}/blog/page/2, ...)
+                for next_path in re.findall(r'<link rel="next" href="(/[^"?]+)">', html):
+                    if next_path not in self.pages:
+                        self.pages.append(next_path)
                 return True
             else:
                 print(f"❌ Failed to generate {page_path}: HTTP {response.status_code}")
@@ -151,15 +177,31 @@ class StaticSiteGenerator:
             print(f"❌ Error generating {page_path}: {e}")
             return False
     
+    def generate_search_index(self):
+        """Write the per-language, prefix-sharded search index read by static/js/search.js"""
+        try:
+            from main import LANGUAGES, search_index
+
+            for lang in LANGUAGES:
+                index_dir = self.output_dir / "search" / lang
+                files = search_index.export(lang)
+                total_bytes = 0
+                for relative_path, data in files.items():
+                    file_path = index_dir / relative_path
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                    file_path.write_text(payload, encoding='utf-8')
+                    total_bytes += len(payload.encode('utf-8'))
+                print(f"✅ Search index ({lang}): {len(files)} files, {total_bytes / 1024:.1f} KiB")
+
+        except Exception as e:
+            print(f"⚠️  Could not generate search index: {e}")
+
     def _read_frontmatter(self, filepath):
         """Parse YAML frontmatter from a markdown file."""
         try:
-            content = filepath.read_text(encoding='utf-8')
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    return yaml.safe_load(parts[1]) or {}
-            return {}
+            metadata, _ = read_frontmatter(filepath, with_body=False)
+            return metadata
         except Exception:
             return {}
 
@@ -441,16 +483,22 @@ class StaticSiteGenerator:
             self.discover_news()
             self.discover_notebooks()
             
-            # Step 5: Generate all pages
+            # Step 5: Generate all pages (paginated listings append their later pages as they go)
             success_count = 0
             for page in self.pages:
                 if self.generate_page(page):
                     success_count += 1
             
-            # Step 6: Generate 404 page
+            # Notebook images are written as the notebook pages are converted
+            self.copy_notebook_assets()
+            
+            # Step 6: Generate the static search index
+            self.generate_search_index()
+            
+            # Step 7: Generate 404 page
             self.generate_404_page()
             
-            # Step 7: Generate redirects for old routes
+            # Step 8: Generate redirects for old routes
             self.generate_redirects()
             
             print(f"\n🎉 Site generation complete!")
@@ -0,0 +1,136 @@
+"""
+HTML Sanitizer
+==============
+
+Cleans nbconvert output for embedding in a page, in a single pass over
+the HTML with the standard library's html.parser:
+
+- <script> and <style> elements are dropped with their contents
+- the notebook container (the element with class jp-Notebook) is found
+  by following the nesting of its tag, and only its contents are kept
+- without a container, the top-level cell <div>s are kept; without
+  those, everything that is left
+
+The top-level cells are also collected one by one, so split_cells can
+serve a long notebook a range of cells at a time.
+
+The parser tokenizes the input once and copies tags through as written,
+so the time taken grows linearly with the size of the notebook.
+"""
+
+from html.parser import HTMLParser
+from typing import List
+
+DROPPED_TAGS = ('script', 'style')
+CONTAINER_CLASS = 'jp-Notebook'
+# Class names of top-level cell <div>s
+CELL_CLASSES = ('cell', 'jp-Cell')
+
+
+class NotebookHTMLCleaner(HTMLParser):
+    def __init__(self):
+        # Character references are copied through as written, not decoded
+        super().__init__(convert_charrefs=False)
+        # Tag whose contents are being skipped
+        self.dropping = None
+        # Tag of the notebook container while inside it, and its nesting depth
+        self.container = None
+        self.container_depth = 0
+        self.found_container = False
+        # <div> nesting depth inside a top-level cell
+        self.cell_depth = 0
+        self.container_parts: List[str] = []
+        # The parts of each top-level cell
+        self.cells: List[List[str]] = []
+        self.parts: List[str] = []
+
+    def emit(self, text: str):
+        self.parts.append(text)
+        if self.container is not None:
+            self.container_parts.append(text)
+        if self.cell_depth:
+            self.cells[-1].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropping:
+            return
+        if tag in DROPPED_TAGS:
+            self.dropping = tag
+            return
+        classes = (dict(attrs).get('class') or '').split()
+        if not self.found_container and CONTAINER_CLASS in classes:
+            self.found_container = True
+            self.parts.append(self.get_starttag_text())
+            self.container = tag
+            self.container_depth = 1
+            return
+        if self.container is not None and tag == self.container:
+            self.container_depth += 1
+        if tag == 'div':
+            if self.cell_depth:
+                self.cell_depth += 1
+            elif any(name in CELL_CLASSES for name in classes):
+                self.cells.append([])
+                self.cell_depth = 1
+        self.emit(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.dropping and tag not in DROPPED_TAGS:
+            self.emit(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self.dropping:
+            if tag == self.dropping:
+                self.dropping = None
+            return
+        if tag in DROPPED_TAGS:
+            return
+        if self.container is not None and tag == self.container:
+            self.container_depth -= 1
+            if self.container_depth == 0:
+                self.container = None
+                self.parts.append(f'</{tag}>')
+                return
+        self.emit(f'</{tag}>')
+        if self.cell_depth and tag == 'div':
+            self.cell_depth -= 1
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.emit(data)
+
+    def handle_entityref(self, name):
+        if not self.dropping:
+            self.emit(f'&{name};')
+
+    def handle_charref(self, name):
+        if not self.dropping:
+            self.emit(f'&#{name};')
+
+    def handle_comment(self, data):
+        if not self.dropping:
+            self.emit(f'<!--{data}-->')
+
+    def content(self) -> str:
+        """The kept HTML, once everything has been fed"""
+        if self.found_container:
+            return ''.join(self.container_parts)
+        if self.cells:
+            return ''.join(''.join(cell) for cell in self.cells)
+        return ''.join(self.parts)
+
+
+def clean_notebook_html(html: str) -> str:
+    """nbconvert output reduced to the notebook's cells, wrapped in div.notebook-content"""
+    cleaner = NotebookHTMLCleaner()
+    cleaner.feed(html)
+    cleaner.close()
+    return f'<div class="notebook-content">{cleaner.content()}</div>'
+
+
+def split_cells(html: str) -> List[str]:
+    """The HTML of each top-level cell of a (cleaned) notebook page"""
+    cleaner = NotebookHTMLCleaner()
+    cleaner.feed(html)
+    cleaner.close()
+    return [''.join(cell) for cell in cleaner.cells]
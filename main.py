@@ -8,28 +8,101 @@ blog functionality, Jupyter notebook integration, and news updates.
 Author: Sharbatanu Chatterjee
 """
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import List, Optional, Tuple
 import os
+from urllib.parse import quote, urlencode
 import yaml
 from blog_manager import BlogManager
-from notebook_manager import NotebookManager
+from notebook_manager import NotebookManager, NotebookBusy
+from notebook_assets import DEFAULT_ASSETS_DIR as NOTEBOOK_ASSETS_DIR, DEFAULT_ASSETS_URL as NOTEBOOK_ASSETS_URL
+from notebook_cache import NotebookCache, DEFAULT_CACHE_DIR as DEFAULT_NOTEBOOK_CACHE_DIR
 from news_manager import NewsManager
 from publications_manager import PublicationsManager
 from talks_manager import TalksManager
 from teaching_manager import TeachingManager
+from content_watcher import ContentPoller, ContentWatcher
+from content_cache import ContentCache, DEFAULT_CACHE_DIR
+from content_repository import warm_up
+from shared_content import path_from_env, share_content
+from search_index import SearchIndex, snippet
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load all content up front, then watch content/ and locales/
+    (WATCH_CONTENT=1) or rescan every CONTENT_REFRESH_SECONDS (default 10,
+    0 never); requests themselves never rescan
+    """
+    # CONTENT_WORKERS > 1 renders all content across that many processes at startup
+    workers = int(os.environ.get('CONTENT_WORKERS', '1'))
+    # SHARED_CONTENT=<path> (or 1) maps one content file shared by all server workers
+    shared_path = os.environ.get('SHARED_CONTENT')
+    if shared_path:
+        share_content(content_repositories(), path_from_env(shared_path))
+    elif workers > 1:
+        warm_up(content_repositories(), workers=workers)
+    else:
+        for repository in content_repositories():
+            repository.refresh()
+    for repository in content_repositories():
+        stats = repository.stats()
+        print(f"📚 {repository.content_dir}: {stats['entries']} files, "
+              f"{stats['misses']} parsed, {stats['hits']} unchanged")
+    if content_cache is not None:
+        print(content_cache.report())
+    
+    watcher = None
+    if os.environ.get('WATCH_CONTENT') == '1':
+        watcher = ContentWatcher(
+            content_repositories(),
+            notebook_manager=notebook_manager,
+            on_locale_change=reload_translation,
+            on_refresh=search_index.refresh
+        )
+        if not watcher.start():
+            watcher = None
+    if watcher is None:
+        watcher = ContentPoller(
+            content_repositories(),
+            notebook_manager=notebook_manager,
+            interval=float(os.environ.get('CONTENT_REFRESH_SECONDS', '10')),
+            # Reindexed in the poller's thread, so searches find it up to date
+            on_refresh=search_index.refresh
+        )
+        watcher.start()
+    # After the watcher or poller has turned off per-read rescans, so this
+    # reads the content loaded above instead of scanning it again
+    search_index.refresh()
+    yield
+    await watcher.stop()
+    notebook_manager.shutdown()
 
 app = FastAPI(
     title="Sharbatanu Chatterjee - Academic Website",
     description="Personal academic website with multilingual support",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
+class ImmutableStaticFiles(StaticFiles):
+    """Files named after their content hash: a name never gets new bytes, so browsers may keep them"""
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
 # Setup static files and templates
+# Notebook images are written while the server runs; on a fresh checkout the
+# directory does not exist yet, and StaticFiles fails every request without it
+Path(NOTEBOOK_ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+app.mount(NOTEBOOK_ASSETS_URL, ImmutableStaticFiles(directory=NOTEBOOK_ASSETS_DIR), name="notebook_assets")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
@@ -66,31 +139,107 @@ def get_language_switch_url(current_path: str, current_lang: str, target_lang: s
     else:
         return f"/{target_lang}/"
 
-# Add the helper function to Jinja2 environment
+def get_facet_url(base_path: str, selected: dict, facet: str, value=None) -> str:
+    """Listing URL keeping the selected filters, with one facet set to value (or cleared if None)"""
+    params = {key: current for key, current in selected.items() if current and key != facet}
+    if value is not None:
+        params[facet] = value
+    return f"{base_path}?{urlencode(params)}" if params else base_path
+
+# Add the helper functions to Jinja2 environment
 templates.env.globals['get_language_switch_url'] = get_language_switch_url
+templates.env.globals['get_facet_url'] = get_facet_url
 
 # Load translations
+def load_language(lang: str) -> dict:
+    with open(f"locales/{lang}.yml", "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+        # Flatten so translations['en']['key'] is accessible
+        if lang in data:
+            return data[lang]
+        return data
+
 def load_translations():
     translations = {}
     for lang in LANGUAGES:
-        with open(f"locales/{lang}.yml", "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-            # Flatten so translations['en']['key'] is accessible
-            if lang in data:
-                translations[lang] = data[lang]
-            else:
-                translations[lang] = data
+        translations[lang] = load_language(lang)
     return translations
 
 translations = load_translations()
 
+def reload_translation(path: Path):
+    """Patch one language into the shared translations dict after its file changed"""
+    lang = path.stem
+    if lang in LANGUAGES and path.exists():
+        translations[lang] = load_language(lang)
+
+# Compiled content survives restarts unless CONTENT_CACHE=0
+content_cache = None
+notebook_cache = NotebookCache()
+if os.environ.get('CONTENT_CACHE') != '0':
+    content_cache = ContentCache(os.environ.get('CONTENT_CACHE_DIR', DEFAULT_CACHE_DIR))
+    notebook_cache = NotebookCache(os.environ.get('NOTEBOOK_CACHE_DIR', DEFAULT_NOTEBOOK_CACHE_DIR))
+
 # Initialize managers
-blog_manager = BlogManager()
-notebook_manager = NotebookManager()
-news_manager = NewsManager()
-publications_manager = PublicationsManager()
-talks_manager = TalksManager()
-teaching_manager = TeachingManager()
+blog_manager = BlogManager(disk_cache=content_cache)
+notebook_manager = NotebookManager(html_cache=notebook_cache)
+
+# Seconds before a "still rendering" notebook page reloads itself
+NOTEBOOK_RETRY_AFTER = 5
+# Cells in the first part of a notebook page, the rest being fetched from
+# /{lang}/notebooks/{slug}/cells as the reader scrolls; 0 sends whole notebooks
+NOTEBOOK_PAGE_CELLS = int(os.environ.get('NOTEBOOK_PAGE_CELLS', '30'))
+# Characters of cell HTML in one response, however few cells that is (at least one)
+NOTEBOOK_PAGE_CHARS = 512 * 1024
+news_manager = NewsManager(disk_cache=content_cache)
+publications_manager = PublicationsManager(disk_cache=content_cache)
+talks_manager = TalksManager(disk_cache=content_cache)
+teaching_manager = TeachingManager(disk_cache=content_cache)
+
+def content_repositories():
+    return [manager.repository for manager in
+            (blog_manager, news_manager, publications_manager, talks_manager, teaching_manager)]
+
+# Full-text search over every section, keyed by the section's URL segment
+search_index = SearchIndex({
+    'blog': blog_manager.repository,
+    'news': news_manager.repository,
+    'publications': publications_manager.repository,
+    'talks': talks_manager.repository,
+    'teaching': teaching_manager.repository,
+})
+
+# Listing page sizes
+BLOG_PAGE_SIZE = 10
+NEWS_PAGE_SIZE = 20
+PUBLICATIONS_PAGE_SIZE = 20
+# The publication facet filters are query-string links; 0 leaves them out
+# (the static build, where every query string serves the same page)
+PUBLICATION_FACETS = os.environ.get('PUBLICATION_FACETS', '1') != '0'
+
+def paginate_listing(get_page, per_page: int, base_path: str, lang: str, page: int, cursor: str = None) -> dict:
+    """
+    Fetch one listing page and attach its previous/next URLs.
+
+    Cursor requests link onward with cursors; page-number requests link to
+    /page/N paths, which the static generator can write out as files.
+    """
+    try:
+        pagination = get_page(lang, page=page, cursor=cursor, per_page=per_page)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor is None and not 1 <= page <= pagination['pages']:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    if cursor is not None:
+        next_url = f"{base_path}?cursor={quote(pagination['next_cursor'])}" if pagination['next_cursor'] else None
+        prev_url = f"{base_path}?cursor={quote(pagination['prev_cursor'])}" if pagination['prev_cursor'] else base_path
+    else:
+        next_url = f"{base_path}/page/{pagination['page'] + 1}" if pagination['next_cursor'] else None
+        prev_url = f"{base_path}/page/{pagination['page'] - 1}" if pagination['page'] > 2 else base_path
+    pagination['next_url'] = next_url
+    pagination['prev_url'] = prev_url if pagination['has_prev'] else None
+    return pagination
 
 @app.get("/", response_class=HTMLResponse)
 @app.get("/{lang}/", response_class=HTMLResponse)
@@ -120,17 +269,23 @@ async def home(request: Request, lang: str = DEFAULT_LANGUAGE):
 
 @app.get("/blog", response_class=HTMLResponse)
 @app.get("/{lang}/blog", response_class=HTMLResponse)
-async def blog(request: Request, lang: str = DEFAULT_LANGUAGE, tag: str = None):
-    """Blog listing page with optional tag filtering"""
+@app.get("/blog/page/{page}", response_class=HTMLResponse)
+@app.get("/{lang}/blog/page/{page}", response_class=HTMLResponse)
+async def blog(request: Request, lang: str = DEFAULT_LANGUAGE, tag: str = None,
+               page: int = 1, cursor: str = None):
+    """Blog listing page with optional tag filtering, paginated by page number or cursor"""
     if lang not in LANGUAGES:
         raise HTTPException(status_code=404, detail="Language not supported")
     
     # Get blog posts - filtered by tag if provided
+    pagination = None
     if tag:
         posts = blog_manager.get_posts_by_tag(tag, lang)
         selected_tag = tag
     else:
-        posts = blog_manager.get_posts(lang, limit=10)
+        pagination = paginate_listing(blog_manager.get_posts_page, BLOG_PAGE_SIZE,
+                                      f"/{lang}/blog", lang, page, cursor)
+        posts = pagination['items']
         selected_tag = None
     
     tags = blog_manager.get_tags(lang)
@@ -145,7 +300,8 @@ async def blog(request: Request, lang: str = DEFAULT_LANGUAGE, tag: str = None):
             "translations": translations,
             "posts": posts,
             "tags": tags,
-            "selected_tag": selected_tag
+            "selected_tag": selected_tag,
+            "pagination": pagination
         }
     )
 
@@ -160,15 +316,8 @@ async def blog_post(request: Request, slug: str, lang: str = DEFAULT_LANGUAGE):
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
-    # Get related posts (same tags)
-    related_posts = []
-    if post.tags:
-        for tag in post.tags[:2]:  # Use first 2 tags
-            related = blog_manager.get_posts_by_tag(tag, lang)
-            related_posts.extend([p for p in related if p.slug != slug])
-        # Remove duplicates and limit
-        seen = set()
-        related_posts = [p for p in related_posts if p.slug not in seen and not seen.add(p.slug)][:3]
+    # Related posts, ranked by tag overlap and cached per item
+    related_posts = blog_manager.get_related_posts(slug, lang)
     
     return templates.TemplateResponse(
         "blog_post.html", 
@@ -184,20 +333,43 @@ async def blog_post(request: Request, slug: str, lang: str = DEFAULT_LANGUAGE):
     )
 
 # Publications routes
+def parse_year_range(year: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """'2024' -> (2024, 2024); '2020-2024', '2020-' and '-2024' give open or closed ranges"""
+    if not year:
+        return None, None
+    start, separator, end = year.partition('-')
+    try:
+        year_from = int(start) if start.strip() else None
+        year_to = (int(end) if end.strip() else None) if separator else year_from
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid year")
+    return year_from, year_to
+
 @app.get("/publications", response_class=HTMLResponse)
 @app.get("/{lang}/publications", response_class=HTMLResponse)
-async def publications(request: Request, lang: str = DEFAULT_LANGUAGE, tag: str = None):
-    """Publications listing page with optional tag filtering"""
+@app.get("/publications/page/{page}", response_class=HTMLResponse)
+@app.get("/{lang}/publications/page/{page}", response_class=HTMLResponse)
+async def publications(request: Request, lang: str = DEFAULT_LANGUAGE,
+                       year: str = None, pub_type: List[str] = Query(None, alias="type"),
+                       tag: List[str] = Query(None), author: List[str] = Query(None),
+                       page: int = 1, cursor: str = None):
+    """Publications listing page, filterable by year (range), type, tag and author, paginated when unfiltered"""
     if lang not in LANGUAGES:
         raise HTTPException(status_code=404, detail="Language not supported")
     
-    # Get publications - filtered by tag if provided
-    if tag:
-        publications_list = publications_manager.get_publications_by_tag(tag, lang)
-        selected_tag = tag
+    # Facet counts always cover the current filters; the list is paginated only when unfiltered
+    year_from, year_to = parse_year_range(year)
+    faceted = publications_manager.query_publications(
+        lang, year_from=year_from, year_to=year_to, types=pub_type, tags=tag, authors=author
+    )
+    pagination = None
+    if year or pub_type or tag or author:
+        publications_list = faceted['items']
     else:
-        publications_list = publications_manager.get_publications(lang)
-        selected_tag = None
+        pagination = paginate_listing(publications_manager.get_publications_page, PUBLICATIONS_PAGE_SIZE,
+                                      f"/{lang}/publications", lang, page, cursor)
+        publications_list = pagination['items']
+    selected_tag = tag[0] if tag else None
     
     tags = publications_manager.get_tags(lang)
     
@@ -211,7 +383,15 @@ async def publications(request: Request, lang: str = DEFAULT_LANGUAGE, tag: str
             "translations": translations,
             "publications": publications_list,
             "tags": tags,
-            "selected_tag": selected_tag
+            "selected_tag": selected_tag,
+            "pagination": pagination,
+            "facets": faceted['facets'] if PUBLICATION_FACETS else None,
+            "selected": {
+                "year": year,
+                "type": pub_type[0] if pub_type else None,
+                "tag": selected_tag,
+                "author": author[0] if author else None
+            }
         }
     )
 
@@ -226,15 +406,8 @@ async def publication_detail(request: Request, slug: str, lang: str = DEFAULT_LA
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
     
-    # Get related publications (same tags)
-    related_publications = []
-    if publication.tags:
-        for tag in publication.tags[:2]:  # Use first 2 tags
-            related = publications_manager.get_publications_by_tag(tag, lang)
-            related_publications.extend([p for p in related if p.slug != slug])
-        # Remove duplicates and limit
-        seen = set()
-        related_publications = [p for p in related_publications if p.slug not in seen and not seen.add(p.slug)][:3]
+    # Related publications, ranked by tag overlap and cached per item
+    related_publications = publications_manager.get_related_publications(slug, lang)
     
     return templates.TemplateResponse(
         "publication_detail.html", 
@@ -292,15 +465,8 @@ async def talk_detail(request: Request, slug: str, lang: str = DEFAULT_LANGUAGE)
     if not talk:
         raise HTTPException(status_code=404, detail="Talk not found")
     
-    # Get related talks (same tags)
-    related_talks = []
-    if talk.tags:
-        for tag in talk.tags[:2]:  # Use first 2 tags
-            related = talks_manager.get_talks_by_tag(tag, lang)
-            related_talks.extend([t for t in related if t.slug != slug])
-        # Remove duplicates and limit
-        seen = set()
-        related_talks = [t for t in related_talks if t.slug not in seen and not seen.add(t.slug)][:3]
+    # Related talks, ranked by tag overlap and cached per item
+    related_talks = talks_manager.get_related_talks(slug, lang)
     
     return templates.TemplateResponse(
         "talk_detail.html", 
@@ -358,15 +524,8 @@ async def teaching_detail(request: Request, slug: str, lang: str = DEFAULT_LANGU
     if not teaching_item:
         raise HTTPException(status_code=404, detail="Teaching item not found")
     
-    # Get related teaching items (same tags)
-    related_teaching = []
-    if teaching_item.tags:
-        for tag in teaching_item.tags[:2]:  # Use first 2 tags
-            related = teaching_manager.get_teaching_by_tag(tag, lang)
-            related_teaching.extend([t for t in related if t.slug != slug])
-        # Remove duplicates and limit
-        seen = set()
-        related_teaching = [t for t in related_teaching if t.slug not in seen and not seen.add(t.slug)][:3]
+    # Related teaching items, ranked by tag overlap and cached per item
+    related_teaching = teaching_manager.get_related_teaching(slug, lang)
     
     return templates.TemplateResponse(
         "teaching_detail.html", 
@@ -415,11 +574,42 @@ async def notebook_view(request: Request, slug: str, lang: str = DEFAULT_LANGUAG
     if not notebook_info:
         raise HTTPException(status_code=404, detail="Notebook not found")
     
-    # Convert to HTML
-    notebook_html = notebook_manager.convert_to_html(slug, lang)
+    context = {
+        "request": request, 
+        "lang": lang, 
+        "available_languages": LANGUAGES,
+        "page": "notebooks",
+        "translations": translations,
+        "notebook": notebook_info,
+    }
+    
+    # Convert to HTML in the conversion pool; a long conversion gets a
+    # "still rendering" page that reloads itself instead of a stalled request
+    try:
+        notebook_html = await notebook_manager.render_html(slug, lang)
+    except NotebookBusy:
+        return templates.TemplateResponse(
+            "notebook_view.html",
+            dict(context, notebook_html="", rendering=True, retry_after=NOTEBOOK_RETRY_AFTER),
+            status_code=503,
+            headers={"Retry-After": str(NOTEBOOK_RETRY_AFTER)}
+        )
     if not notebook_html:
         raise HTTPException(status_code=500, detail="Failed to convert notebook")
     
+    # Long notebooks start with their first cells and load the rest while scrolling;
+    # pages without cells (conversion errors) are shown whole
+    if NOTEBOOK_PAGE_CELLS:
+        cells = await notebook_manager.split_html(slug, notebook_html)
+        if cells:
+            cells_html, next_cell = notebook_manager.select_cells(
+                cells, 0, NOTEBOOK_PAGE_CELLS, NOTEBOOK_PAGE_CHARS)
+            return templates.TemplateResponse(
+                "notebook_view.html",
+                dict(context, notebook_html=f'<div class="notebook-content">{cells_html}</div>',
+                     next_cell=next_cell, page_cells=NOTEBOOK_PAGE_CELLS)
+            )
+    
     # Check if it's an error message (fallback)
     if "Notebook Conversion Error" in notebook_html:
         # Still show the page but with error content
@@ -427,26 +617,46 @@ async def notebook_view(request: Request, slug: str, lang: str = DEFAULT_LANGUAG
     
     return templates.TemplateResponse(
         "notebook_view.html", 
-        {
-            "request": request, 
-            "lang": lang, 
-            "available_languages": LANGUAGES,
-            "page": "notebooks",
-            "translations": translations,
-            "notebook": notebook_info,
-            "notebook_html": notebook_html
-        }
+        dict(context, notebook_html=notebook_html)
     )
 
+@app.get("/notebooks/{slug}/cells")
+@app.get("/{lang}/notebooks/{slug}/cells")
+async def notebook_cells(slug: str, lang: str = DEFAULT_LANGUAGE, start: int = Query(0, ge=0),
+                         count: int = Query(NOTEBOOK_PAGE_CELLS or 30, ge=1, le=200)):
+    """A range of a notebook's cells as HTML, for loading long notebooks progressively"""
+    if lang not in LANGUAGES:
+        raise HTTPException(status_code=404, detail="Language not supported")
+    if not notebook_manager.get_notebook(slug, lang):
+        raise HTTPException(status_code=404, detail="Notebook not found")
+    
+    try:
+        cells = await notebook_manager.render_cells(slug, lang)
+    except NotebookBusy:
+        return JSONResponse(
+            {"detail": "Notebook is still being rendered"},
+            status_code=503,
+            headers={"Retry-After": str(NOTEBOOK_RETRY_AFTER)}
+        )
+    if cells is None:
+        raise HTTPException(status_code=500, detail="Failed to convert notebook")
+    
+    html, next_cell = notebook_manager.select_cells(cells, start, count, NOTEBOOK_PAGE_CHARS)
+    return {"html": html, "start": start, "next": next_cell, "total": len(cells)}
+
 @app.get("/news", response_class=HTMLResponse)
 @app.get("/{lang}/news", response_class=HTMLResponse)
-async def news(request: Request, lang: str = DEFAULT_LANGUAGE):
-    """Latest news and updates page"""
+@app.get("/news/page/{page}", response_class=HTMLResponse)
+@app.get("/{lang}/news/page/{page}", response_class=HTMLResponse)
+async def news(request: Request, lang: str = DEFAULT_LANGUAGE, page: int = 1, cursor: str = None):
+    """Latest news and updates page, paginated by page number or cursor"""
     if lang not in LANGUAGES:
         raise HTTPException(status_code=404, detail="Language not supported")
     
     # Get news items
-    news_items = news_manager.get_news_items(lang, limit=20)
+    pagination = paginate_listing(news_manager.get_news_page, NEWS_PAGE_SIZE,
+                                  f"/{lang}/news", lang, page, cursor)
+    news_items = pagination['items']
     categories = news_manager.get_categories(lang)
     
     return templates.TemplateResponse(
@@ -458,7 +668,8 @@ async def news(request: Request, lang: str = DEFAULT_LANGUAGE):
             "page": "news",
             "translations": translations,
             "news_items": news_items,
-            "categories": categories
+            "categories": categories,
+            "pagination": pagination
         }
     )
 
@@ -603,5 +814,53 @@ async def contact(request: Request, lang: str = DEFAULT_LANGUAGE):
         }
     )
 
+@app.get("/search", response_class=HTMLResponse)
+@app.get("/{lang}/search", response_class=HTMLResponse)
+def search(request: Request, lang: str = DEFAULT_LANGUAGE, q: str = ""):
+    """Full-text search across all content (a plain def: FastAPI runs it off the event loop)"""
+    if lang not in LANGUAGES:
+        raise HTTPException(status_code=404, detail="Language not supported")
+    
+    results = search_index.search(q, lang) if q.strip() else []
+    
+    return templates.TemplateResponse(
+        "search.html", 
+        {
+            "request": request, 
+            "lang": lang, 
+            "available_languages": LANGUAGES,
+            "page": "search",
+            "translations": translations,
+            "query": q,
+            "results": results,
+            "snippet": snippet
+        }
+    )
+
+@app.get("/search.json")
+@app.get("/{lang}/search.json")
+def search_json(lang: str = DEFAULT_LANGUAGE, q: str = "", limit: int = 20):
+    """Search results as JSON"""
+    if lang not in LANGUAGES:
+        raise HTTPException(status_code=404, detail="Language not supported")
+    
+    results = search_index.search(q, lang, limit=max(1, min(limit, 100))) if q.strip() else []
+    return {
+        "query": q,
+        "lang": lang,
+        "results": [
+            {
+                "section": result['section'],
+                "slug": result['item'].slug,
+                "title": result['item'].title,
+                "date": result['item'].date.strftime('%Y-%m-%d'),
+                "url": result['url'],
+                "snippet": snippet(result['item']),
+                "score": round(result['score'], 4),
+            }
+            for result in results
+        ],
+    }
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
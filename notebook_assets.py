@@ -0,0 +1,101 @@
+"""
+Notebook Image Assets
+=====================
+
+Images in notebook outputs, written once to static files named after
+their SHA-256 instead of being inlined into the page as base64.
+
+The same plot in several notebooks (or several versions of a notebook)
+is stored once, and since a file's name changes whenever its bytes do,
+browsers may cache the files forever. Image tags get loading="lazy" and,
+where the size can be read from the file, width and height, so the page
+lays out before the images arrive.
+"""
+
+import hashlib
+import re
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from atomic_file import atomic_write
+
+DEFAULT_ASSETS_DIR = 'static/notebooks/_assets'
+DEFAULT_ASSETS_URL = '/static/notebooks/_assets'
+
+_IMG_TAG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_SRC = re.compile(r'\bsrc="([^"]*)"')
+_ASSET_NAME = re.compile(r'[0-9a-f]{64}\.[a-z]+')
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) of PNG, GIF or JPEG data, or None"""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', data[6:10])
+    if data[:2] == b'\xff\xd8':
+        # Walk the JPEG segments to the start-of-frame header
+        pos = 2
+        while pos + 9 < len(data):
+            if data[pos] != 0xFF:
+                return None
+            marker = data[pos + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                pos += 2
+                continue
+            length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                return width, height
+            pos += 2 + length
+    return None
+
+
+def write_asset(assets_dir: str, data: bytes, extension: str) -> str:
+    """Store data under its content hash; returns the file name"""
+    name = f"{hashlib.sha256(data).hexdigest()}{extension}"
+    path = Path(assets_dir) / name
+    if not path.exists():
+        # Written atomically so the server never sends partial images
+        atomic_write(path, data)
+    return name
+
+
+def publish_images(html: str, outputs: Dict[str, bytes], assets_dir: str, assets_url: str) -> str:
+    """
+    Write the images nbconvert extracted (its resources['outputs']) to
+    assets_dir and point the page's image tags at them.
+    """
+    published = {}
+
+    def rewrite(match):
+        tag = match.group(0)
+        src = _SRC.search(tag)
+        if src is None or src.group(1) not in outputs:
+            return tag
+        filename = src.group(1)
+        if filename not in published:
+            data = outputs[filename]
+            published[filename] = (write_asset(assets_dir, data, Path(filename).suffix.lower()), image_size(data))
+        name, size = published[filename]
+
+        attributes = f'src="{assets_url}/{name}" loading="lazy" decoding="async"'
+        if size is not None and ' width=' not in tag and ' height=' not in tag:
+            attributes += f' width="{size[0]}" height="{size[1]}"'
+        return tag[:src.start()] + attributes + tag[src.end():]
+
+    return _IMG_TAG.sub(rewrite, html)
+
+
+def missing_assets(html: str, assets_dir: str, assets_url: str) -> bool:
+    """Whether any image the page refers to in assets_dir is gone (e.g. the directory was cleared)"""
+    prefix = f'src="{assets_url}/'
+    start = html.find(prefix)
+    while start != -1:
+        start += len(prefix)
+        name = _ASSET_NAME.match(html, start)
+        if name is not None and not (Path(assets_dir) / name.group(0)).exists():
+            return True
+        start = html.find(prefix, start)
+    return False
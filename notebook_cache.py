@@ -0,0 +1,163 @@
+"""
+Notebook HTML Cache
+===================
+
+Converted notebook HTML, kept in memory and on disk so a notebook is only
+run through nbconvert once per version.
+
+Entries are keyed by a hash of the notebook's bytes together with the
+exporter settings and the nbconvert version, so editing a notebook or
+changing how notebooks are converted never serves stale HTML. Both tiers
+evict the least recently used entries once they grow past their byte
+budget.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import nbconvert
+
+from atomic_file import atomic_write
+
+DEFAULT_CACHE_DIR = '.cache/notebooks'
+
+
+class NotebookCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """cache_dir=None keeps entries in memory only"""
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        # key -> (html, size in bytes), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        # Bytes on disk, counted on the first write
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(data: bytes, settings: Dict) -> str:
+        """Key for a notebook's bytes converted with the given exporter settings"""
+        digest = hashlib.sha256()
+        digest.update(f"nbconvert={nbconvert.__version__};".encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached HTML for a key, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            try:
+                html = path.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                html = None
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable notebook cache entry {key}: {e}")
+                html = None
+            if html is not None:
+                # Mark it recently used for the disk eviction order
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, html)
+                self.hits += 1
+                return html
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, html: str):
+        """Store converted HTML in memory and, if enabled, on disk"""
+        size = self._remember(key, html)
+        if self.cache_dir is None:
+            return
+
+        try:
+            # Written atomically so readers never see partial data
+            atomic_write(self._path(key), html.encode('utf-8'))
+        except Exception as e:
+            print(f"⚠️  Could not write notebook cache entry {key}: {e}")
+            return
+
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(entry.stat().st_size for entry in self.entries())
+        else:
+            self._disk_bytes += size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk(keep=key)
+
+    def _remember(self, key: str, html: str) -> int:
+        """Add an entry to the memory tier, evicting the least recently used ones over budget"""
+        size = len(html.encode('utf-8'))
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        # An entry larger than the whole budget is served from disk only
+        if size <= self.max_bytes:
+            self._entries[key] = (html, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return size
+
+    def _evict_disk(self, keep: str):
+        """Delete the least recently used files until the disk tier fits its budget"""
+        files = []
+        for path in self.entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            if path.stem == keep:
+                continue
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def entries(self):
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return []
+        return self.cache_dir.glob('*/*.html')
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        for path in list(self.entries()):
+            path.unlink()
+        self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
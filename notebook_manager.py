@@ -5,17 +5,84 @@ Jupyter Notebook Manager
 Handles Jupyter notebook conversion and display using nbconvert.
 """
 
-import os
+import asyncio
+import math
+import multiprocessing
 import json
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from nbconvert import HTMLExporter
-from nbconvert.preprocessors import TagRemovePreprocessor
-import yaml
+from nbconvert.preprocessors import ExtractOutputPreprocessor
+
+from content_repository import ContentRepository
+from html_sanitizer import clean_notebook_html, split_cells
+from notebook_assets import DEFAULT_ASSETS_DIR, DEFAULT_ASSETS_URL, missing_assets, publish_images
+from notebook_cache import NotebookCache
+from notebook_metadata import scan_notebook
+
+class NotebookBusy(Exception):
+    """The notebook is still being converted, or too many conversions are queued"""
+
+
+class ConversionTimeout(BaseException):
+    """
+    Raised inside a pool worker when a conversion runs out of time; a
+    BaseException so the conversion's own fallbacks do not swallow it.
+    """
+
+
+def _raise_conversion_timeout(signum, frame):
+    raise ConversionTimeout()
+
 
 class NotebookManager:
-    def __init__(self, content_dir: str = 'content/notebooks'):
+    # Exporter settings of the notebook page, also part of the HTML cache key
+    EXPORTER_SETTINGS = {
+        'template_name': 'basic',
+        'exclude_input_prompt': True,
+        'exclude_output_prompt': True,
+        # Disable any problematic features
+        'anchor_link_text': '',
+        # Important: Enable embed_images to handle matplotlib plots properly
+        'embed_images': True,
+    }
+    # Bump when _clean_html changes, so cached pages are converted again
+    CLEAN_VERSION = 2
+    
+    def __init__(self, content_dir: str = 'content/notebooks', html_cache: Optional[NotebookCache] = None,
+                 workers: int = 2, max_pending: int = 8, wait_timeout: float = 10.0, job_timeout: float = 120.0,
+                 assets_dir: Optional[str] = DEFAULT_ASSETS_DIR, assets_url: str = DEFAULT_ASSETS_URL):
+        """
+        assets_dir: where output images are written, served at assets_url;
+            None inlines them into the page as base64 instead
+        workers: conversion processes for render_html
+        max_pending: conversions queued or running before requests are turned away
+        wait_timeout: how long a request waits for its conversion
+        job_timeout: when a conversion is abandoned
+        """
         self.content_dir = content_dir
+        self.assets = (assets_dir, assets_url) if assets_dir else None
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait_timeout = wait_timeout
+        self.job_timeout = job_timeout
+        # Started on the first render_html conversion
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # HTML cache key -> running conversion
+        self._jobs: Dict[str, asyncio.Future] = {}
+        # Converted pages; memory-only unless a disk-backed cache is passed in
+        self.html_cache = html_cache if html_cache is not None else NotebookCache()
+        # filepath -> (file signature, HTML cache key), so unchanged files are not re-hashed
+        self._html_keys = {}
+        # Cache keys whose pages were checked to have all their images on disk
+        self._assets_checked = set()
+        # HTML cache key -> (page HTML, its cells) of recently paged notebooks
+        self._cells: "OrderedDict[str, tuple]" = OrderedDict()
+        self.max_split_notebooks = 8
         # Use a very basic configuration to avoid MathBlockParser issues
         self.html_exporter = HTMLExporter()
         self.html_exporter.template_name = 'classic'
@@ -24,54 +91,73 @@ class NotebookManager:
         
         # Minimal configuration to avoid markdown parsing conflicts
         self.html_exporter.anchor_link_text = ''
+        
+        # When False, notebooks are only rescanned on an explicit refresh()
+        self.auto_refresh = True
+        # (filepath -> (file signature, notebook info), lang -> notebooks sorted
+        # by date, lang -> slug -> notebook); replaced as a whole by refresh(),
+        # so readers never see the files of one scan with the index of another
+        self._index = ({}, {}, {})
     
     def get_notebooks(self, lang: str = 'en') -> List[Dict]:
         """Get all notebooks with metadata"""
-        notebooks = []
+        self._ensure_fresh()
+        return list(self._index[1].get(lang, []))
+    
+    def _ensure_fresh(self):
+        if self.auto_refresh or not self._index[0]:
+            self.refresh()
+    
+    def refresh(self):
+        """Re-read changed notebooks and rebuild the per-language listing and slug index"""
         notebook_dir = Path(self.content_dir)
+        current = self._index[0]
+        files = {}
+        changed = False
         
-        if not notebook_dir.exists():
-            return notebooks
+        if notebook_dir.exists():
+            for file_path in notebook_dir.glob('*.ipynb'):
+                key = str(file_path)
+                try:
+                    signature = ContentRepository.file_signature(file_path)
+                    cached = current.get(key)
+                    if cached is not None and cached[0] == signature:
+                        files[key] = cached
+                        continue
+                    files[key] = (signature, self._get_notebook_info(file_path))
+                    changed = True
+                except Exception as e:
+                    print(f"Error processing notebook {file_path}: {e}")
         
-        for file_path in notebook_dir.glob('*.ipynb'):
-            try:
-                notebook_info = self._get_notebook_info(file_path, lang)
-                if notebook_info:
-                    notebooks.append(notebook_info)
-            except Exception as e:
-                print(f"Error processing notebook {file_path}: {e}")
+        if not changed and files.keys() == current.keys():
+            return
+        
+        by_lang = {}
+        for _, notebook_info in files.values():
+            for lang in notebook_info['languages']:
+                by_lang.setdefault(lang, []).append(notebook_info)
         
-        # Sort by date or title
-        notebooks.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return notebooks
+        by_slug = {}
+        for lang, notebooks in by_lang.items():
+            # Sort by date or title
+            notebooks.sort(key=lambda x: x.get('date', ''), reverse=True)
+            by_slug[lang] = {notebook['slug']: notebook for notebook in notebooks}
+        
+        self._index = (files, by_lang, by_slug)
     
-    def _get_notebook_info(self, file_path: Path, lang: str) -> Optional[Dict]:
-        """Extract metadata from notebook"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            notebook = json.load(f)
+    def _get_notebook_info(self, file_path: Path) -> Dict:
+        """Extract metadata from notebook, reading only the parts of the file that hold it"""
+        scan = scan_notebook(file_path)
         
         # Get metadata from notebook
-        metadata = notebook.get('metadata', {})
+        metadata = scan['metadata']
         custom_meta = metadata.get('custom', {})
         
-        # Check if notebook is for this language
-        notebook_lang = custom_meta.get('lang', 'en')
-        if notebook_lang != lang:
-            return None
+        # A string or a list, like the lang frontmatter of markdown content
+        languages = ContentRepository.item_languages(custom_meta)
         
-        # Extract title from first markdown cell or filename
-        title = custom_meta.get('title')
-        if not title:
-            for cell in notebook.get('cells', []):
-                if cell.get('cell_type') == 'markdown':
-                    source = ''.join(cell.get('source', []))
-                    lines = source.split('\n')
-                    for line in lines:
-                        if line.startswith('# '):
-                            title = line[2:].strip()
-                            break
-                    if title:
-                        break
+        # Title from the metadata, else the first markdown heading, else the filename
+        title = custom_meta.get('title') or scan['title']
         
         if not title:
             title = file_path.stem.replace('-', ' ').replace('_', ' ').title()
@@ -85,43 +171,214 @@ class NotebookManager:
             'author': custom_meta.get('author', 'Sharbatanu Chatterjee'),
             'tags': custom_meta.get('tags', []),
             'category': custom_meta.get('category', 'analysis'),
-            'lang': notebook_lang
+            'lang': languages[0],
+            'languages': languages
         }
     
     def get_notebook(self, slug: str, lang: str = 'en') -> Optional[Dict]:
         """Get specific notebook by slug"""
-        notebooks = self.get_notebooks(lang)
-        for notebook in notebooks:
-            if notebook['slug'] == slug:
-                return notebook
-        return None
+        self._ensure_fresh()
+        return self._index[2].get(lang, {}).get(slug)
+    
+    def _html_key(self, notebook_file: Path) -> tuple:
+        """(file signature, HTML cache key) of a notebook, hashing it only when it changed"""
+        signature = ContentRepository.file_signature(notebook_file)
+        cached = self._html_keys.get(str(notebook_file))
+        if cached is None or cached[0] != signature:
+            settings = dict(self.EXPORTER_SETTINGS, clean_version=self.CLEAN_VERSION,
+                            assets_url=self.assets[1] if self.assets else None)
+            cached = (signature, self.html_cache.cache_key(notebook_file.read_bytes(), settings))
+            self._html_keys[str(notebook_file)] = cached
+        return cached
     
     def convert_to_html(self, slug: str, lang: str = 'en') -> Optional[str]:
-        """Convert notebook to HTML"""
+        """Convert notebook to HTML, served from the HTML cache after the first conversion"""
         notebook_file = Path(self.content_dir) / f"{slug}.ipynb"
         
         if not notebook_file.exists():
             return None
         
+        signature, cache_key = self._html_key(notebook_file)
+        body = self._cached(cache_key)
+        if body is None:
+            body, cacheable = self._convert(str(notebook_file), self.assets)
+            self._store(notebook_file, signature, cache_key, body, cacheable)
+        return body
+    
+    async def render_html(self, slug: str, lang: str = 'en') -> Optional[str]:
+        """
+        convert_to_html for request handlers: conversions run in a process
+        pool, so a slow notebook never blocks the event loop.
+        
+        Concurrent requests for the same notebook share one conversion.
+        Raises NotebookBusy when max_pending conversions are already
+        queued, or when this one takes longer than wait_timeout seconds;
+        it then keeps running and its result is cached for the next view.
+        """
+        notebook_file = Path(self.content_dir) / f"{slug}.ipynb"
+        
+        if not notebook_file.exists():
+            return None
+        
+        signature, cache_key = self._html_key(notebook_file)
+        body = self._cached(cache_key)
+        if body is not None:
+            return body
+        
+        job = self._jobs.get(cache_key)
+        if job is None:
+            if len(self._jobs) >= self.max_pending:
+                raise NotebookBusy(f"{len(self._jobs)} notebook conversions already pending")
+            job = asyncio.wrap_future(self._executor().submit(
+                NotebookManager._convert_in_worker, str(notebook_file), self.job_timeout, self.assets))
+            self._jobs[cache_key] = job
+            job.add_done_callback(lambda done: self._finish(notebook_file, signature, cache_key, done))
+        
+        try:
+            # Shielded: giving up on the wait must not cancel the conversion
+            body, _ = await asyncio.wait_for(asyncio.shield(job), self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise NotebookBusy(f"{slug} is still being converted")
+        except Exception as e:
+            print(f"Error converting notebook {slug}: {e}")
+            return None
+        return body
+    
+    async def render_cells(self, slug: str, lang: str = 'en') -> Optional[List[str]]:
+        """
+        The HTML of each cell of a notebook, for serving it a range at a
+        time. Empty if the page has no cells (e.g. an error page).
+        """
+        body = await self.render_html(slug, lang)
+        if body is None:
+            return None
+        return await self.split_html(slug, body)
+    
+    async def split_html(self, slug: str, body: str) -> List[str]:
+        """
+        The cells of a page render_html returned, split once and kept for
+        the most recently paged notebooks
+        """
+        _, cache_key = self._html_key(Path(self.content_dir) / f"{slug}.ipynb")
+        entry = self._cells.get(cache_key)
+        if entry is None or entry[0] != body:
+            # Off the event loop: splitting a long notebook takes a while
+            cells = await asyncio.get_running_loop().run_in_executor(None, split_cells, body)
+            entry = self._cells[cache_key] = (body, cells)
+            while len(self._cells) > self.max_split_notebooks:
+                self._cells.popitem(last=False)
+        self._cells.move_to_end(cache_key)
+        return entry[1]
+    
+    @staticmethod
+    def select_cells(cells: List[str], start: int, count: int, max_chars: int) -> Tuple[str, Optional[int]]:
+        """
+        Up to `count` cells from `start`, stopping early (after at least one
+        cell) once they pass max_chars. Returns their HTML and where the
+        next range starts, or None after the last cell.
+        """
+        parts = []
+        size = 0
+        end = start
+        while end < len(cells) and end - start < count:
+            if parts and size + len(cells[end]) > max_chars:
+                break
+            parts.append(cells[end])
+            size += len(cells[end])
+            end += 1
+        return ''.join(parts), (end if end < len(cells) else None)
+    
+    def _cached(self, cache_key: str) -> Optional[str]:
+        """Cached HTML for a key, unless images it refers to have since been deleted"""
+        body = self.html_cache.get(cache_key)
+        if body is not None and self.assets is not None and cache_key not in self._assets_checked:
+            if missing_assets(body, *self.assets):
+                return None
+            self._assets_checked.add(cache_key)
+        return body
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned rather than forked: the server process runs threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+    
+    def _finish(self, notebook_file: Path, signature: tuple, cache_key: str, job: asyncio.Future):
+        """Cache a finished pool conversion (runs on the event loop)"""
+        self._jobs.pop(cache_key, None)
+        if job.cancelled():
+            return
+        error = job.exception()
+        if error is not None:
+            if isinstance(error, BrokenProcessPool):
+                # A worker died; start a fresh pool for the next conversion
+                self._pool = None
+            return
+        body, cacheable = job.result()
+        self._store(notebook_file, signature, cache_key, body, cacheable)
+    
+    def _store(self, notebook_file: Path, signature: tuple, cache_key: str, body: str, cacheable: bool):
+        # Only cache what was converted from the bytes the key was computed from
+        try:
+            unchanged = ContentRepository.file_signature(notebook_file) == signature
+        except OSError:
+            unchanged = False
+        if cacheable and unchanged:
+            self.html_cache.put(cache_key, body)
+    
+    def shutdown(self):
+        """Stop the conversion processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    @staticmethod
+    def _convert_in_worker(notebook_file: str, timeout: Optional[float],
+                           assets: Optional[Tuple[str, str]] = None) -> Tuple[str, bool]:
+        """Pool worker: _convert, interrupted after `timeout` seconds where SIGALRM exists"""
+        use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _raise_conversion_timeout)
+            signal.alarm(max(1, math.ceil(timeout)))
+        try:
+            return NotebookManager._convert(notebook_file, assets)
+        except ConversionTimeout:
+            print(f"Notebook conversion timed out after {timeout}s: {notebook_file}")
+            return NotebookManager._error_html(Path(notebook_file).stem, f"conversion took longer than {timeout}s"), False
+        finally:
+            if use_alarm:
+                signal.alarm(0)
+    
+    @staticmethod
+    def _convert(notebook_file: str, assets: Optional[Tuple[str, str]] = None) -> Tuple[str, bool]:
+        """
+        Run one notebook through nbconvert and clean the result.
+        
+        With assets=(assets_dir, assets_url), output images are written to
+        assets_dir and linked rather than inlined.
+        
+        Returns the HTML and whether it may be cached: fallbacks and error
+        pages are not, so the next view tries a proper conversion again.
+        """
+        slug = Path(notebook_file).stem
         try:
             # Try the simplest possible conversion first
             try:
                 # Create a fresh, minimal exporter for each conversion
                 exporter = HTMLExporter()
-                exporter.template_name = 'basic'
-                exporter.exclude_input_prompt = True
-                exporter.exclude_output_prompt = True
+                for name, value in NotebookManager.EXPORTER_SETTINGS.items():
+                    setattr(exporter, name, value)
+                if assets is not None:
+                    # Output images become files instead of data: URIs
+                    exporter.register_preprocessor(ExtractOutputPreprocessor(enabled=True), enabled=True)
                 
-                # Disable any problematic features
-                exporter.anchor_link_text = ''
-                
-                # Important: Enable embed_images to handle matplotlib plots properly
-                exporter.embed_images = True
-                
-                (body, resources) = exporter.from_filename(str(notebook_file))
+                (body, resources) = exporter.from_filename(notebook_file)
                 
                 # Handle any images in resources
-                if hasattr(resources, 'outputs') and resources.outputs:
+                if assets is not None and resources.get('outputs'):
+                    body = publish_images(body, resources['outputs'], *assets)
+                elif hasattr(resources, 'outputs') and resources.outputs:
                     print(f"Found {len(resources.outputs)} output images for {slug}")
                 
             except Exception as e:
@@ -130,25 +387,27 @@ class NotebookManager:
                 try:
                     fallback_exporter = HTMLExporter()
                     fallback_exporter.embed_images = True
-                    (body, resources) = fallback_exporter.from_filename(str(notebook_file))
+                    (body, resources) = fallback_exporter.from_filename(notebook_file)
                 except Exception as e2:
                     print(f"Fallback conversion also failed: {e2}")
                     # Last resort: manual conversion
-                    return self._manual_conversion(notebook_file)
+                    return NotebookManager._manual_conversion(Path(notebook_file)), False
             
             # Clean up the HTML (remove nbconvert boilerplate)
-            body = self._clean_html(body)
-            
-            return body
+            return NotebookManager._clean_html(body), True
         
         except Exception as e:
             print(f"Error converting notebook {slug}: {e}")
             # Return a fallback error message instead of None
-            return f'''
+            return NotebookManager._error_html(slug, str(e)), False
+    
+    @staticmethod
+    def _error_html(slug: str, details: str) -> str:
+        return f'''
             <div class="alert alert-warning">
                 <h5>Notebook Conversion Error</h5>
                 <p>Sorry, we encountered an issue converting this notebook for web display.</p>
-                <p><strong>Error details:</strong> {str(e)}</p>
+                <p><strong>Error details:</strong> {details}</p>
                 <p>You can try downloading the notebook file directly or viewing it in a Jupyter environment.</p>
                 <a href="/static/notebooks/{slug}.ipynb" class="btn btn-primary" download>
                     <i class="fas fa-download me-2"></i>Download Notebook
@@ -156,33 +415,13 @@ class NotebookManager:
             </div>
             '''
     
-    def _clean_html(self, html: str) -> str:
-        """Clean up nbconvert HTML output"""
-        import re
-        
-        # Simple cleaning - just remove some problematic elements
-        # Remove style tags that might conflict
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL)
-        
-        # Remove script tags for security
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
-        
-        # Extract main content if possible, otherwise return as-is
-        content_match = re.search(r'<div[^>]*class="[^"]*jp-Notebook[^"]*"[^>]*>(.*?)</div>\s*$', html, re.DOTALL)
-        if content_match:
-            return f'<div class="notebook-content">{content_match.group(1)}</div>'
-        
-        # Fallback: try to find any div with notebook content
-        content_match = re.search(r'<div[^>]*class="[^"]*cell[^"]*"[^>]*>.*?</div>', html, re.DOTALL)
-        if content_match:
-            # Find all cell divs and wrap them
-            cell_matches = re.findall(r'<div[^>]*class="[^"]*cell[^"]*"[^>]*>.*?</div>', html, re.DOTALL)
-            return f'<div class="notebook-content">{"".join(cell_matches)}</div>'
-        
-        # Last resort: return simplified HTML
-        return f'<div class="notebook-content">{html}</div>'
+    @staticmethod
+    def _clean_html(html: str) -> str:
+        """Clean up nbconvert HTML output: keep the notebook's cells, drop styles and scripts"""
+        return clean_notebook_html(html)
     
-    def _manual_conversion(self, notebook_file: Path) -> str:
+    @staticmethod
+    def _manual_conversion(notebook_file: Path) -> str:
         """Manual notebook conversion as fallback when nbconvert fails"""
         try:
             with open(notebook_file, 'r', encoding='utf-8') as f:
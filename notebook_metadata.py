@@ -0,0 +1,194 @@
+"""
+Notebook Metadata Scan
+======================
+
+Reads what a notebook listing needs, the notebook metadata and the first
+`# ` heading of its markdown cells, without loading the whole notebook.
+
+Notebooks saved by Jupyter keep their metadata at the end of the file,
+after the cells and their (often megabytes of base64) outputs, so the
+metadata is read from the last few kilobytes. Cells are only read from
+the start, one at a time, when the metadata has no title and until a
+markdown heading turns up. Files laid out differently are still read
+correctly, just further.
+"""
+
+import codecs
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Bytes read from the end of the file when looking for the metadata
+TAIL_BYTES = 16 * 1024
+# First read from the start of the file; each further read doubles
+HEAD_CHUNK = 16 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+_METADATA_KEY = re.compile(r'"metadata"\s*:\s*')
+# What may follow the top-level metadata: the remaining scalar keys, then the end
+_DOCUMENT_END = re.compile(r'\s*(?:,\s*"nbformat(?:_minor)?"\s*:\s*\d+\s*)*\}\s*$')
+
+
+class _Truncated(Exception):
+    """The value runs past the end of the file"""
+
+
+class _JsonStream:
+    """Decodes JSON values one at a time from a file, reading it in growing chunks"""
+
+    def __init__(self, f):
+        self.f = f
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.chunk = HEAD_CHUNK
+        self.eof = False
+
+    def _read(self):
+        if self.eof:
+            raise _Truncated()
+        data = self.f.read(self.chunk)
+        self.chunk *= 2
+        self.eof = not data
+        # Drop what has been consumed so the buffer holds at most the current value
+        self.text = self.text[self.pos:] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            self._read()
+
+    def take(self, expected: str):
+        if self.peek() != expected:
+            raise ValueError(f"expected {expected!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._read()
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and not self.eof:
+                self._read()
+                continue
+            self.pos = end
+            return value
+
+    def finish_array(self):
+        """Consume the rest of an array that is partly read"""
+        while self.peek() != ']':
+            if self.peek() == ',':
+                self.take(',')
+            self.value()
+        self.take(']')
+
+
+def markdown_title(cell: Dict) -> Optional[str]:
+    """The first `# ` heading of a markdown cell"""
+    if cell.get('cell_type') != 'markdown':
+        return None
+    source = cell.get('source', [])
+    if not isinstance(source, str):
+        source = ''.join(source)
+    for line in source.split('\n'):
+        if line.startswith('# ') and line[2:].strip():
+            return line[2:].strip()
+    return None
+
+
+def _tail_metadata(f, size: int) -> Optional[Dict]:
+    """The top-level metadata, if it is the last object of the file and within TAIL_BYTES"""
+    start = max(0, size - TAIL_BYTES)
+    f.seek(start)
+    # A character cut in half at the start cannot be part of the metadata found below
+    tail = f.read().decode('utf-8', errors='replace')
+    # Cells have metadata too; the last match that ends the document is the notebook's
+    for match in reversed(list(_METADATA_KEY.finditer(tail))):
+        try:
+            metadata, end = _decoder.raw_decode(tail, match.end())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(metadata, dict) and _DOCUMENT_END.match(tail, end):
+            return metadata
+    return None
+
+
+def scan_notebook(path: Union[str, Path]) -> Dict:
+    """
+    Read a notebook's metadata and title heading.
+
+    Returns a dict with 'metadata' (the notebook metadata, {} if absent),
+    'title' (the first markdown `# ` heading, or None; only looked for
+    when metadata.custom has no title) and 'bytes_read'.
+    Raises ValueError if the file is not a notebook.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        metadata = _tail_metadata(f, size)
+        bytes_read = min(size, TAIL_BYTES)
+        need_title = not (metadata or {}).get('custom', {}).get('title')
+        title = None
+
+        if metadata is None or need_title:
+            f.seek(0)
+            stream = _JsonStream(f)
+            try:
+                title, found = _scan_head(stream, need_title, metadata is None)
+            except _Truncated:
+                raise ValueError(f"{path} ends in the middle of the notebook")
+            if metadata is None:
+                metadata = found
+            bytes_read += f.tell()
+
+    return {'metadata': metadata or {}, 'title': title, 'bytes_read': bytes_read}
+
+
+def _scan_head(stream: _JsonStream, need_title: bool, need_metadata: bool):
+    """Walk the top-level object until the title and metadata asked for are known"""
+    title = None
+    metadata = None
+    stream.take('{')
+    if stream.peek() == '}':
+        return None, None
+    while True:
+        key = stream.value()
+        stream.take(':')
+        if key == 'cells' and need_title:
+            stream.take('[')
+            if stream.peek() != ']':
+                while True:
+                    cell = stream.value()
+                    if isinstance(cell, dict):
+                        title = markdown_title(cell)
+                        if title is not None:
+                            break
+                    if stream.peek() != ',':
+                        break
+                    stream.take(',')
+            # Found or not, the cells have been searched
+            need_title = False
+            if not need_metadata:
+                return title, metadata
+            stream.finish_array()
+        else:
+            value = stream.value()
+            if key == 'metadata':
+                metadata = value if isinstance(value, dict) else {}
+                need_metadata = False
+                if not need_title:
+                    return title, metadata
+        if stream.peek() != ',':
+            return title, metadata
+        stream.take(',')
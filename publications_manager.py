@@ -6,74 +6,41 @@ Handles publication entries with metadata and content.
 Similar to BlogManager but for academic publications.
 """
 
-import os
-from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime
-import markdown
-from markdown.extensions import meta
+from typing import List, Dict, Iterable, Optional
 
-class Publication:
-    def __init__(self, filepath: str, lang: str = 'en'):
-        self.filepath = filepath
-        self.lang = lang
-        self.metadata = {}
-        self.content = ""
-        self.html_content = ""
-        
-        self._load_content()
+from content_repository import ContentItem, ContentRepository
+from facet_index import FacetIndex
+
+class Publication(ContentItem):
+    MARKDOWN_EXTENSIONS = ['fenced_code', 'tables']
+    
+    # Derived values are computed once at load
+    __slots__ = ('authors', 'abstract')
     
-    def _load_content(self):
-        """Load and parse the markdown file"""
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _precompute(self):
+        super()._precompute()
         
-        # Split frontmatter and content
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                # Parse YAML frontmatter
-                import yaml
-                self.metadata = yaml.safe_load(parts[1]) or {}
-                self.content = parts[2].strip()
-            else:
-                self.content = content
-        else:
-            self.content = content
+        authors = self.metadata.get('authors', 'Sharbatanu Chatterjee')
+        if isinstance(authors, str):
+            # Split by comma or semicolon and clean up
+            authors = [author.strip() for author in authors.replace(';', ',').split(',')]
+        self.authors = authors if isinstance(authors, list) else ['Sharbatanu Chatterjee']
         
-        # Convert markdown to HTML (without frontmatter)
-        md = markdown.Markdown(extensions=['fenced_code', 'tables'])
-        self.html_content = md.convert(self.content)
+        abstract = self.metadata.get('abstract', '')
+        if not abstract:
+            # Extract first paragraph as abstract
+            first_para = self.content.split('\n\n')[0]
+            abstract = first_para[:300] + '...' if len(first_para) > 300 else first_para
+        self.abstract = abstract
     
     @property
     def title(self) -> str:
         return self.metadata.get('title', 'Untitled Publication')
     
-    @property
-    def date(self) -> datetime:
-        date_str = self.metadata.get('date', '')
-        if date_str:
-            try:
-                return datetime.strptime(str(date_str), '%Y-%m-%d')
-            except:
-                try:
-                    return datetime.strptime(str(date_str), '%Y')
-                except:
-                    pass
-        return datetime.now()
-    
     @property
     def year(self) -> int:
         return self.date.year
     
-    @property
-    def authors(self) -> List[str]:
-        authors = self.metadata.get('authors', 'Sharbatanu Chatterjee')
-        if isinstance(authors, str):
-            # Split by comma or semicolon and clean up
-            return [author.strip() for author in authors.replace(';', ',').split(',')]
-        return authors if isinstance(authors, list) else ['Sharbatanu Chatterjee']
-    
     @property
     def journal(self) -> str:
         return self.metadata.get('journal', '')
@@ -82,27 +49,6 @@ class Publication:
     def venue(self) -> str:
         return self.metadata.get('venue', self.journal)
     
-    @property
-    def abstract(self) -> str:
-        abstract = self.metadata.get('abstract', '')
-        if not abstract:
-            # Extract first paragraph as abstract
-            first_para = self.content.split('\n\n')[0]
-            abstract = first_para[:300] + '...' if len(first_para) > 300 else first_para
-        return abstract
-    
-    @property
-    def tags(self) -> List[str]:
-        tags = self.metadata.get('tags', [])
-        if isinstance(tags, str):
-            return [tag.strip() for tag in tags.split(',')]
-        return tags
-    
-    @property
-    def slug(self) -> str:
-        filename = Path(self.filepath).stem
-        return self.metadata.get('slug', filename)
-    
     @property
     def doi(self) -> str:
         return self.metadata.get('doi', '')
@@ -139,53 +85,66 @@ class Publication:
         return citation
 
 class PublicationsManager:
-    def __init__(self, content_dir: str = 'content/publications'):
+    # Facets of the publication list and how to read them off a publication
+    FACETS = {
+        'year': lambda pub: [pub.year],
+        'type': lambda pub: [pub.publication_type],
+        'tag': lambda pub: pub.tags,
+        'author': lambda pub: pub.authors,
+    }
+    
+    def __init__(self, content_dir: str = 'content/publications', disk_cache=None):
         self.content_dir = content_dir
-        self._publications_cache = {}
+        self.repository = ContentRepository(content_dir, Publication, disk_cache=disk_cache)
+        # lang -> (repository snapshot version, FacetIndex)
+        self._facets: Dict[str, tuple] = {}
+    
+    def get_facet_index(self, lang: str = 'en') -> FacetIndex:
+        """Facet bitsets for a language, rebuilt only when the publications change"""
+        snapshot = self.repository.snapshot
+        cached = self._facets.get(lang)
+        if cached is None or cached[0] != snapshot.version:
+            index = FacetIndex(list(snapshot.partition(lang)), self.FACETS)
+            cached = self._facets[lang] = (snapshot.version, index)
+        return cached[1]
+    
+    def query_publications(self, lang: str = 'en', year_from: Optional[int] = None,
+                           year_to: Optional[int] = None, types: Optional[Iterable[str]] = None,
+                           tags: Optional[Iterable[str]] = None,
+                           authors: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Publications matching all given facets (any value within a facet),
+        newest first, with per-facet counts for the filter UI.
+        
+        Returns {'items', 'total', 'facets'}; facets maps year, type, tag
+        and author to {value: count}.
+        """
+        index = self.get_facet_index(lang)
+        years = None
+        if year_from is not None or year_to is not None:
+            years = [year for year in index.values('year')
+                     if (year_from is None or year >= year_from) and (year_to is None or year <= year_to)]
+            # An empty range must match nothing rather than disable the filter
+            years = years or [None]
+        
+        items, counts = index.query({'year': years, 'type': types, 'tag': tags, 'author': authors})
+        counts['year'] = dict(sorted(counts['year'].items(), reverse=True))
+        for facet in ('type', 'tag', 'author'):
+            counts[facet] = dict(sorted(counts[facet].items(), key=lambda entry: (-entry[1], str(entry[0]).casefold())))
+        return {'items': items, 'total': len(items), 'facets': counts}
     
     def get_publications(self, lang: str = 'en', limit: Optional[int] = None) -> List[Publication]:
         """Get all publications for a language, sorted by date (newest first)"""
-        publications = []
-        pub_dir = Path(self.content_dir)
-        
-        if not pub_dir.exists():
-            return publications
-        
-        # Look for markdown files
-        for file_path in pub_dir.glob('*.md'):
-            try:
-                pub = Publication(str(file_path), lang)
-                # Check if publication is for this language
-                pub_lang = pub.metadata.get('lang', 'en')
-                
-                # Handle both string and list formats
-                if isinstance(pub_lang, list):
-                    # If it's a list, check if our language is in it
-                    if lang in pub_lang:
-                        publications.append(pub)
-                elif isinstance(pub_lang, str):
-                    # Strip quotes if present and compare
-                    pub_lang = pub_lang.strip('"\'')
-                    if pub_lang == lang:
-                        publications.append(pub)
-            except Exception as e:
-                print(f"Error loading publication {file_path}: {e}")
-        
-        # Sort by date, newest first
-        publications.sort(key=lambda p: p.date, reverse=True)
-        
-        if limit:
-            publications = publications[:limit]
-        
-        return publications
+        return self.repository.list(lang, limit)
+    
+    def get_publications_page(self, lang: str = 'en', page: int = 1, cursor: Optional[str] = None,
+                              per_page: int = 20) -> Dict:
+        """Get one page of publications, by page number or by cursor"""
+        return self.repository.paginate(lang, per_page, page, cursor)
     
     def get_publication(self, slug: str, lang: str = 'en') -> Optional[Publication]:
         """Get a specific publication by slug"""
-        publications = self.get_publications(lang)
-        for pub in publications:
-            if pub.slug == slug:
-                return pub
-        return None
+        return self.repository.get(slug, lang)
     
     def get_publications_by_year(self, lang: str = 'en') -> Dict[int, List[Publication]]:
         """Get publications grouped by year"""
@@ -200,18 +159,20 @@ class PublicationsManager:
     
     def get_publications_by_type(self, pub_type: str, lang: str = 'en') -> List[Publication]:
         """Get publications filtered by type"""
-        publications = self.get_publications(lang)
-        return [pub for pub in publications if pub.publication_type == pub_type]
+        return self.query_publications(lang, types=[pub_type])['items']
     
     def get_publications_by_tag(self, tag: str, lang: str = 'en') -> List[Publication]:
         """Get publications filtered by tag"""
-        all_publications = self.get_publications(lang)
-        return [pub for pub in all_publications if tag.lower() in [t.lower() for t in pub.tags]]
+        return self.repository.by_tag(tag, lang)
     
     def get_tags(self, lang: str = 'en') -> List[str]:
         """Get all unique tags from publications"""
-        all_publications = self.get_publications(lang)
-        tags = set()
-        for pub in all_publications:
-            tags.update(pub.tags)
-        return sorted(list(tags))
\ No newline at end of file
+        return self.repository.tags(lang)
+    
+    def get_tag_counts(self, lang: str = 'en') -> Dict[str, int]:
+        """Get the number of publications per tag"""
+        return self.repository.tag_counts(lang)
+    
+    def get_related_publications(self, slug: str, lang: str = 'en', limit: int = 3) -> List:
+        """Get the publications sharing the most tags with a publication"""
+        return self.repository.related(slug, lang, limit)
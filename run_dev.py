@@ -16,6 +16,8 @@ sys.path.insert(0, str(current_dir))
 
 # Set environment variables for development
 os.environ['DEVELOPMENT'] = '1'
+# Patch content and translations live instead of rescanning per request
+os.environ.setdefault('WATCH_CONTENT', '1')
 
 def is_port_in_use(port):
     """Check if a port is already in use"""
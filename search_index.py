@@ -0,0 +1,387 @@
+"""
+Search Index
+============
+
+In-process full-text search over every content type, ranked with BM25.
+
+Each language has its own inverted index (term -> document -> weighted
+term frequency). Titles, tags, authors, venues, excerpts, summaries,
+abstracts and bodies are indexed, with title and tag/author matches
+weighted higher. The index follows the content repositories
+incrementally: when a repository's indexes are rebuilt, only the items
+whose parsed object changed are re-tokenised. Updates are made to a copy
+(each term's postings copied on first change) that is swapped in with
+one assignment, so searches never wait for them or take a lock.
+
+Tokenisation keeps Bengali words whole (Python's `\\w` splits them at
+vowel signs and virama), folds case, and strips accents from Latin
+script so "analyse" finds "analysé". A few plural and case endings
+are folded per language, so "poissons" matches "poisson" and
+"মস্তিষ্কের" matches "মস্তিষ্ক".
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from content_repository import ContentRepository
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Metadata fields indexed besides the body, with their weight
+FIELD_WEIGHTS = {
+    'title': 3,
+    'tags': 2,
+    'authors': 2,
+    'journal': 1,
+    'venue': 1,
+    'event': 1,
+    'institution': 1,
+    'category': 1,
+    'excerpt': 1,
+    'summary': 1,
+    'abstract': 1,
+    'description': 1,
+}
+
+# Bengali block plus the zero-width (non-)joiners used inside Bengali words
+_TOKEN = re.compile(r'[\w\u0980-\u09FF\u200C\u200D]+')
+_BENGALI = re.compile(r'[\u0980-\u09FF]')
+
+STOPWORDS = {
+    'en': {
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+        'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with',
+    },
+    'fr': {
+        'au', 'aux', 'ce', 'ces', 'dans', 'de', 'des', 'du', 'en', 'est', 'et', 'la', 'le',
+        'les', 'mais', 'ou', 'par', 'pour', 'qui', 'que', 'sur', 'un', 'une',
+    },
+    'bn': {
+        'ও', 'এবং', 'এই', 'এর', 'করে', 'কি', 'জন্য', 'তার', 'থেকে', 'না', 'যে', 'হয়', 'আর', 'একটি',
+    },
+}
+
+# Inflection endings folded away (longest first), a deliberately light stemmer
+SUFFIXES = {
+    'en': ('s',),
+    'fr': ('s', 'x'),
+    'bn': ('গুলোর', 'গুলো', 'দের', 'টির', 'টা', 'টি', 'ের', 'কে', 'তে', 'ে'),
+}
+
+
+def _strip_suffix(term: str, lang: str) -> str:
+    for suffix in SUFFIXES.get(lang, ()):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            stem = term[:-len(suffix)]
+            # 'process', 'class': a double s is not a plural
+            if suffix == 's' and stem.endswith('s'):
+                return term
+            return stem
+    return term
+
+
+def _fold_latin(token: str) -> str:
+    """Strip accents: 'détaillée' -> 'detaillee'"""
+    decomposed = unicodedata.normalize('NFKD', token)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def _normalise_token(token: str, lang: str) -> Optional[str]:
+    """Search term for a casefolded token, or None if it should be skipped"""
+    if _BENGALI.search(token):
+        token = token.replace('\u200c', '').replace('\u200d', '')
+    else:
+        if not token.isascii():
+            token = _fold_latin(token)
+        token = token.strip('_')
+        # Single letters are mostly French elisions (l', d', qu')
+        if len(token) < 2:
+            return None
+    if not token or token in STOPWORDS.get(lang, ()):
+        return None
+    return _strip_suffix(token, lang)
+
+
+def tokenize(text: str, lang: str = 'en') -> List[str]:
+    """Split text into normalised search terms for a language"""
+    if not text:
+        return []
+    tokens = _TOKEN.findall(unicodedata.normalize('NFC', text).casefold())
+    return [term for term in (_normalise_token(token, lang) for token in tokens) if term]
+
+
+def shard_name(term: str, prefix_length: int = 2) -> str:
+    """File-name-safe shard of a term: its leading code points in hex ('brain' -> '62-72')"""
+    return '-'.join(f"{ord(c):x}" for c in term[:prefix_length])
+
+
+def _field_text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(v) for v in value)
+    return str(value) if value else ''
+
+
+def document_terms(item, lang: str) -> Dict[str, int]:
+    """Weighted term frequencies of an item's searchable fields"""
+    counts: Dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(_field_text(item.metadata.get(field)), lang):
+            counts[term] = counts.get(term, 0) + weight
+    for term in tokenize(item.content, lang):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def snippet(item, length: int = 200) -> str:
+    """Plain-text preview of an item for result listings"""
+    for field in ('excerpt', 'summary', 'abstract', 'description'):
+        text = item.metadata.get(field)
+        if text:
+            break
+    else:
+        text = item.content.split('\n\n')[0]
+    text = str(text).strip()
+    return text[:length] + '...' if len(text) > length else text
+
+
+class _LanguageIndex:
+    """Postings and document lengths for one language"""
+    __slots__ = ('postings', 'lengths', 'total_length', '_owned')
+
+    def __init__(self):
+        # term -> document key -> weighted term frequency
+        self.postings: Dict[str, Dict[Tuple[str, str], int]] = {}
+        # document key -> weighted length
+        self.lengths: Dict[Tuple[str, str], int] = {}
+        self.total_length = 0
+        # Terms whose document dicts this index may change: the others are
+        # shared with the published index it was copied from
+        self._owned = set()
+
+    def copy(self) -> '_LanguageIndex':
+        """A copy to update while this one is searched; each term's documents are copied on first change"""
+        index = _LanguageIndex()
+        index.postings = dict(self.postings)
+        index.lengths = dict(self.lengths)
+        index.total_length = self.total_length
+        return index
+
+    def _writable(self, term: str) -> Dict[Tuple[str, str], int]:
+        documents = self.postings.get(term)
+        if documents is None or term not in self._owned:
+            documents = self.postings[term] = dict(documents or ())
+            self._owned.add(term)
+        return documents
+
+    def add(self, key: Tuple[str, str], terms: Dict[str, int]):
+        for term, count in terms.items():
+            self._writable(term)[key] = count
+        length = sum(terms.values())
+        self.lengths[key] = length
+        self.total_length += length
+
+    def remove(self, key: Tuple[str, str], terms: Dict[str, int]):
+        for term in terms:
+            if term in self.postings:
+                documents = self._writable(term)
+                documents.pop(key, None)
+                if not documents:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(key, 0)
+
+
+class _IndexState:
+    """
+    What searches read: built in full by refresh() and published with a
+    single assignment, never changed afterwards
+    """
+    __slots__ = ('versions', 'documents', 'languages')
+
+    def __init__(self, versions=None, documents=None, languages=None):
+        # section -> repository snapshot version indexed
+        self.versions: Dict[str, int] = versions or {}
+        # (section, filepath) -> (item, {lang: term counts})
+        self.documents: Dict[Tuple[str, str], Tuple[object, Dict[str, Dict[str, int]]]] = documents or {}
+        self.languages: Dict[str, _LanguageIndex] = languages or {}
+
+
+class SearchIndex:
+    def __init__(self, sources: Dict[str, ContentRepository]):
+        # section name (as used in URLs, e.g. 'blog') -> repository
+        self.sources = sources
+        self._state = _IndexState()
+        # Serialises updates; searches never take it
+        self._lock = threading.Lock()
+
+    def refresh(self, wait: bool = True) -> int:
+        """
+        Bring the index up to date with the repositories; returns the number
+        of items (re)indexed. With wait=False, returns 0 at once if another
+        thread is already updating it.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return 0
+        try:
+            state = self._state
+            snapshots = {section: repository.snapshot for section, repository in self.sources.items()}
+            changed = [section for section, snapshot in snapshots.items()
+                       if state.versions.get(section) != snapshot.version]
+            if not changed:
+                return 0
+
+            # Updated off to the side, then swapped in
+            updated = _IndexState(dict(state.versions), dict(state.documents),
+                                  {lang: index.copy() for lang, index in state.languages.items()})
+            indexed = 0
+            for section in changed:
+                indexed += self._sync_section(updated, section, snapshots[section].documents)
+                updated.versions[section] = snapshots[section].version
+            self._state = updated
+            return indexed
+        finally:
+            self._lock.release()
+
+    def _sync_section(self, state: _IndexState, section: str, documents: Dict[str, object]) -> int:
+        indexed = 0
+        stale = [key for key in state.documents if key[0] == section and key[1] not in documents]
+        for key in stale:
+            self._remove(state, key)
+
+        for path, item in documents.items():
+            key = (section, path)
+            current = state.documents.get(key)
+            if current is not None and current[0] is item:
+                continue
+            if current is not None:
+                self._remove(state, key)
+            terms_by_lang = {lang: document_terms(item, lang)
+                             for lang in ContentRepository.item_languages(item.metadata)}
+            for lang, terms in terms_by_lang.items():
+                index = state.languages.get(lang)
+                if index is None:
+                    index = state.languages[lang] = _LanguageIndex()
+                index.add(key, terms)
+            state.documents[key] = (item, terms_by_lang)
+            indexed += 1
+        return indexed
+
+    @staticmethod
+    def _remove(state: _IndexState, key: Tuple[str, str]):
+        _, terms_by_lang = state.documents.pop(key)
+        for lang, terms in terms_by_lang.items():
+            state.languages[lang].remove(key, terms)
+
+    def search(self, query: str, lang: str = 'en', limit: Optional[int] = 20) -> List[Dict]:
+        """
+        Items matching any query term, best BM25 score first.
+
+        Each result is a dict with section, item, score and url.
+        """
+        # While another thread reindexes, search the index it is replacing
+        self.refresh(wait=False)
+        state = self._state
+        index = state.languages.get(lang)
+        terms = set(tokenize(query, lang))
+        if index is None or not terms or not index.lengths:
+            return []
+
+        scores: Dict[Tuple[str, str], float] = {}
+        for term in terms:
+            for key, score in self._term_scores(index, term):
+                scores[key] = scores.get(key, 0.0) + score
+
+        if limit:
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1])
+        else:
+            ranked = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+
+        results = []
+        for (section, path), score in ranked:
+            item = state.documents[(section, path)][0]
+            results.append({
+                'section': section,
+                'item': item,
+                'score': score,
+                'url': f"/{lang}/{section}/{item.slug}",
+            })
+        return results
+
+    @staticmethod
+    def _term_scores(index: _LanguageIndex, term: str) -> Iterator[Tuple[Tuple[str, str], float]]:
+        """BM25 contribution of one term to each document containing it"""
+        documents = index.postings.get(term)
+        if not documents:
+            return
+        average_length = index.total_length / len(index.lengths)
+        idf = math.log(1 + (len(index.lengths) - len(documents) + 0.5) / (len(documents) + 0.5))
+        for key, frequency in documents.items():
+            norm = K1 * (1 - B + B * index.lengths[key] / average_length)
+            yield key, idf * frequency * (K1 + 1) / (frequency + norm)
+
+    def export(self, lang: str, prefix_length: int = 2, chunk_size: int = 50) -> Dict[str, object]:
+        """
+        Static, sharded form of one language's index, as {relative path: JSON data}.
+
+        - index.json: document count, shard names and the tokeniser settings
+        - terms/<shard>.json: postings of every term starting with the
+          shard's prefix, as flat [doc id delta, score x 100, ...] lists
+          with the BM25 scores precomputed
+        - docs/<n>.json: url, title, section, date and snippet of
+          documents n * chunk_size onwards; ids follow date order, so
+          recent results mostly come from the first chunk
+
+        A client downloads index.json, one shard per query term and the
+        document chunks of its top results.
+        """
+        self.refresh()
+        state = self._state
+        index = state.languages.get(lang) or _LanguageIndex()
+        keys = sorted(index.lengths, key=lambda key: state.documents[key][0].date, reverse=True)
+        doc_ids = {key: doc_id for doc_id, key in enumerate(keys)}
+
+        files: Dict[str, object] = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = []
+            for section, path in keys[start:start + chunk_size]:
+                item = state.documents[(section, path)][0]
+                chunk.append([f"/{lang}/{section}/{item.slug}", item.title, section,
+                              item.date.strftime('%Y-%m-%d'), snippet(item, 160)])
+            files[f"docs/{start // chunk_size}.json"] = chunk
+
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for term in index.postings:
+            postings = sorted((doc_ids[key], round(score * 100)) for key, score in self._term_scores(index, term))
+            flat, previous = [], 0
+            for doc_id, score in postings:
+                flat.extend((doc_id - previous, score))
+                previous = doc_id
+            shards.setdefault(shard_name(term, prefix_length), {})[term] = flat
+        for name, terms in shards.items():
+            files[f"terms/{name}.json"] = terms
+
+        files['index.json'] = {
+            'version': 1,
+            'lang': lang,
+            'documents': len(keys),
+            'chunk_size': chunk_size,
+            'prefix_length': prefix_length,
+            'shards': sorted(shards),
+            'stopwords': sorted(STOPWORDS.get(lang, ())),
+            'suffixes': list(SUFFIXES.get(lang, ())),
+        }
+        return files
+
+    def stats(self) -> Dict[str, int]:
+        state = self._state
+        return {
+            'documents': len(state.documents),
+            'terms': sum(len(index.postings) for index in state.languages.values()),
+        }
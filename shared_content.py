@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Shared Content File
+===================
+
+One file holding every parsed content item, built once and memory-mapped
+read-only by all server workers, so `uvicorn main:app --workers N` does
+not parse, render and hold the content N times.
+
+Layout:
+
+    magic (8 bytes) | index length (8 bytes, little-endian) | index | blobs
+
+The index is a pickle with, per repository, each file's name, stat
+signature and metadata, and the offsets of its markdown body and
+rendered HTML in the blob area. Bodies and HTML stay in the mapping as
+UTF-8: items hold SharedText views and decode them when they are used
+(a page render, a search snippet), so those pages of the file are
+shared by every worker through the OS page cache instead of being
+copied into each of them.
+
+Set SHARED_CONTENT=<path> to use it; the first worker to start builds
+the file (in a child process) while the others wait, then all of them
+map it. A worker starting later finds it current and maps it without
+parsing anything. Files edited after the build are re-parsed per worker
+as usual, and the file is rebuilt on the next start.
+
+Usage:
+    python shared_content.py build [path]
+    python shared_content.py stats [path]
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import pickle
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent builds just race, the last rename wins
+    fcntl = None
+
+from atomic_file import atomic_write
+from content_cache import FORMAT_VERSION, LIBRARY_VERSIONS, render_settings
+from content_repository import ContentRepository, item_from_record, item_to_record
+
+DEFAULT_SHARED_PATH = '.cache/shared-content.bin'
+
+MAGIC = b'ACSHARE1'
+HEADER = struct.Struct('<8sQ')
+
+# Record fields kept as UTF-8 in the mapping rather than in the pickled index
+SHARED_FIELDS = ('content', 'html')
+
+
+def path_from_env(value: str) -> str:
+    """SHARED_CONTENT=1 means the default location, anything else is a path"""
+    return DEFAULT_SHARED_PATH if value == '1' else value
+
+
+class SharedText:
+    """UTF-8 text at a fixed place in the mapped file, decoded on use"""
+    __slots__ = ('buffer', 'start', 'end')
+
+    def __init__(self, buffer: memoryview, start: int, end: int):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __str__(self) -> str:
+        return str(self.buffer[self.start:self.end], 'utf-8')
+
+    def __repr__(self) -> str:
+        return f"SharedText({self.start}, {self.end})"
+
+
+def repository_key(repository: ContentRepository) -> str:
+    """
+    Identifies a repository's items in the file. It includes the item
+    class's rendering settings, so changing them makes the file stale.
+    """
+    item_class = repository.item_class
+    return (f"{item_class.__module__}.{item_class.__name__}:{Path(repository.content_dir).resolve()}"
+            f":{render_settings(item_class)}")
+
+
+def write_shared_content(repositories: List[ContentRepository], path: str) -> int:
+    """Write every loaded item of the repositories to path; returns the number of items"""
+    index: Dict[str, List[tuple]] = {}
+    blobs = []
+    offset = 0
+    for repository in repositories:
+        entries = index[repository_key(repository)] = []
+        for filepath, signature, item in repository.loaded_items():
+            record = item_to_record(item)
+            spans = {}
+            for field in SHARED_FIELDS:
+                blob = record.pop(field).encode('utf-8')
+                spans[field] = (offset, offset + len(blob))
+                blobs.append(blob)
+                offset += len(blob)
+            entries.append((Path(filepath).name, signature, record, spans))
+
+    data = pickle.dumps({
+        'format': FORMAT_VERSION,
+        'libraries': LIBRARY_VERSIONS,
+        'repositories': index,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Written atomically, so workers never map a partial file
+    atomic_write(path, [HEADER.pack(MAGIC, len(data)), data] + blobs)
+    return sum(len(entries) for entries in index.values())
+
+
+class SharedContent:
+    def __init__(self, path: str):
+        """Map a shared content file; raises ValueError if it is not one this code can read"""
+        with open(path, 'rb') as f:
+            magic, index_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a shared content file")
+            # Read, not mapped: mapped pages would stay resident in every worker
+            index = pickle.loads(f.read(index_length))
+            if index['format'] != FORMAT_VERSION or index['libraries'] != LIBRARY_VERSIONS:
+                raise ValueError(f"{path} was built by a different version")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.repositories: Dict[str, List[tuple]] = index['repositories']
+        self._blobs = memoryview(self._mmap)[HEADER.size + index_length:]
+
+    def is_current(self, repository: ContentRepository) -> bool:
+        """Whether the file holds exactly the repository's files as they are on disk"""
+        entries = self.repositories.get(repository_key(repository))
+        if entries is None:
+            return False
+        stored = {name: signature for name, signature, _, _ in entries}
+        content_dir = Path(repository.content_dir)
+        on_disk = {}
+        if content_dir.exists():
+            for file_path in content_dir.glob(repository.pattern):
+                try:
+                    on_disk[file_path.name] = repository.file_signature(file_path)
+                except OSError:
+                    pass
+        return on_disk == stored
+
+    def attach(self, repository: ContentRepository) -> int:
+        """Install the file's items into a repository; returns the number installed"""
+        entries = self.repositories.get(repository_key(repository), [])
+        items = []
+        for name, signature, record, spans in entries:
+            filepath = str(Path(repository.content_dir) / name)
+            record = dict(record, **{field: SharedText(self._blobs, start, end)
+                                     for field, (start, end) in spans.items()})
+            items.append((filepath, signature, item_from_record(repository.item_class, filepath, record)))
+        return repository.adopt(items)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'items': sum(len(entries) for entries in self.repositories.values()),
+            'blob_bytes': len(self._blobs),
+            'bytes': len(self._mmap),
+        }
+
+
+@contextmanager
+def _build_lock(path: str):
+    """Exclusive lock next to the shared file, so only one worker builds it"""
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _open(path: str) -> Optional[SharedContent]:
+    try:
+        return SharedContent(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️  Ignoring shared content file {path}: {e}")
+        return None
+
+
+def _build(task) -> int:
+    """Worker: load repositories from scratch and write the shared file"""
+    specs, path = task
+    repositories = [ContentRepository(content_dir, item_class, pattern, disk_cache=disk_cache)
+                    for content_dir, item_class, pattern, disk_cache in specs]
+    return write_shared_content(repositories, path)
+
+
+def share_content(repositories: List[ContentRepository], path: str = DEFAULT_SHARED_PATH) -> Optional[SharedContent]:
+    """
+    Load the repositories from the shared file at path, (re)building it
+    first if it is missing or out of date. Returns the mapped file, or
+    None if it could not be built (the repositories are loaded anyway).
+
+    The file is built in a child process, so the worker that builds it
+    does not keep private copies of everything it rendered.
+    """
+    with _build_lock(path):
+        shared = _open(path)
+        if shared is None or not all(shared.is_current(repository) for repository in repositories):
+            specs = [(repository.content_dir, repository.item_class, repository.pattern, repository.disk_cache)
+                     for repository in repositories]
+            try:
+                # Spawned rather than forked: the server process runs threads
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    pool.submit(_build, (specs, path)).result()
+            except Exception as e:
+                print(f"⚠️  Could not build shared content file {path}: {e}")
+            shared = _open(path)
+
+    if shared is not None:
+        for repository in repositories:
+            shared.attach(repository)
+    # Picks up anything edited since the file was read, normally nothing
+    for repository in repositories:
+        repository.refresh()
+    return shared
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the shared content file")
+    parser.add_argument('command', choices=['build', 'stats'])
+    parser.add_argument('path', nargs='?', default=path_from_env(os.environ.get('SHARED_CONTENT', '1')))
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from content_cache import _content_managers
+        repositories = [manager.repository for manager in _content_managers()]
+        with _build_lock(args.path):
+            count = write_shared_content(repositories, args.path)
+        print(f"📦 Wrote {count} items to {args.path}")
+    elif args.command == 'stats':
+        shared = _open(args.path)
+        if shared is None:
+            return 1
+        stats = shared.stats()
+        print(f"📦 {stats['items']} items, {stats['blob_bytes'] / 1024:.1f} KiB of text, "
+              f"{stats['bytes'] / 1024:.1f} KiB in {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+// Static site search
+//
+// Reads the prefix-sharded index written by generate_static_site.py
+// (dist/search/<lang>/): index.json, then one terms/<shard>.json per
+// query term and the docs/<n>.json chunks holding the top results.
+// Shards are fetched on demand and kept for the rest of the visit.
+//
+// On the FastAPI server the page is rendered with its results and this
+// script does nothing; it only takes over when the page was rendered
+// without a query (the static build) but the URL carries ?q=, or when
+// the visitor types into the search box of such a page.
+
+(function () {
+    const container = document.getElementById('search-results');
+    if (!container || !container.dataset.searchIndex) {
+        return;
+    }
+
+    const baseUrl = container.dataset.searchIndex;
+    const form = document.querySelector('form[role="search"]');
+    const input = form ? form.querySelector('input[name="q"]') : null;
+    const labels = JSON.parse(container.dataset.labels || '{}');
+    const maxResults = 20;
+    const cache = new Map();
+    let manifest = null;
+
+    // The server already answered this query
+    const urlQuery = new URLSearchParams(window.location.search).get('q') || '';
+    if (container.dataset.query) {
+        return;
+    }
+
+    function fetchJson(path) {
+        if (!cache.has(path)) {
+            cache.set(path, fetch(baseUrl + path).then(function (response) {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status + ' for ' + path);
+                }
+                return response.json();
+            }));
+        }
+        return cache.get(path);
+    }
+
+    // Mirrors search_index.tokenize(); stopwords and suffixes come from index.json
+    const tokenPattern = /[\p{L}\p{N}_\u0980-\u09FF\u200C\u200D]+/gu;
+    const bengali = /[\u0980-\u09FF]/;
+
+    function normaliseToken(token) {
+        if (bengali.test(token)) {
+            token = token.replace(/[\u200C\u200D]/g, '');
+        } else {
+            token = token.normalize('NFKD').replace(/\p{M}/gu, '').replace(/^_+|_+$/g, '');
+            if (token.length < 2) {
+                return null;
+            }
+        }
+        if (!token || manifest.stopwords.includes(token)) {
+            return null;
+        }
+        for (const suffix of manifest.suffixes) {
+            if (token.endsWith(suffix) && token.length - suffix.length >= 3) {
+                const stem = token.slice(0, -suffix.length);
+                return suffix === 's' && stem.endsWith('s') ? token : stem;
+            }
+        }
+        return token;
+    }
+
+    function tokenize(text) {
+        // toLowerCase() plus the one casefold() difference that matters here
+        const folded = text.normalize('NFC').toLowerCase().replace(/ß/g, 'ss');
+        const tokens = folded.match(tokenPattern) || [];
+        return tokens.map(normaliseToken).filter(Boolean);
+    }
+
+    function shardName(term) {
+        return Array.from(term).slice(0, manifest.prefix_length)
+            .map(function (c) { return c.codePointAt(0).toString(16); })
+            .join('-');
+    }
+
+    function addPostings(scores, flat, best) {
+        let docId = 0;
+        for (let i = 0; i < flat.length; i += 2) {
+            docId += flat[i];
+            const score = flat[i + 1];
+            if (best) {
+                best.set(docId, Math.max(best.get(docId) || 0, score));
+            } else {
+                scores.set(docId, (scores.get(docId) || 0) + score);
+            }
+        }
+    }
+
+    async function search(query) {
+        const terms = Array.from(new Set(tokenize(query)));
+        if (!terms.length) {
+            return [];
+        }
+
+        const shards = await Promise.all(terms.map(function (term) {
+            const name = shardName(term);
+            return manifest.shards.includes(name) ? fetchJson('terms/' + name + '.json') : {};
+        }));
+
+        const scores = new Map();
+        terms.forEach(function (term, index) {
+            const shard = shards[index];
+            const isLast = index === terms.length - 1;
+            if (shard[term] || !isLast || Array.from(term).length < manifest.prefix_length) {
+                addPostings(scores, shard[term] || []);
+                return;
+            }
+            // The last word may still be being typed: match it as a prefix
+            const best = new Map();
+            Object.keys(shard).forEach(function (candidate) {
+                if (candidate.startsWith(term)) {
+                    addPostings(scores, shard[candidate], best);
+                }
+            });
+            best.forEach(function (score, docId) {
+                scores.set(docId, (scores.get(docId) || 0) + score);
+            });
+        });
+
+        // Lower ids are newer documents, so they win ties
+        const ranked = Array.from(scores.entries())
+            .sort(function (a, b) { return b[1] - a[1] || a[0] - b[0]; })
+            .slice(0, maxResults);
+        const chunks = await Promise.all(ranked.map(function (entry) {
+            return fetchJson('docs/' + Math.floor(entry[0] / manifest.chunk_size) + '.json');
+        }));
+        return ranked.map(function (entry, index) {
+            return chunks[index][entry[0] % manifest.chunk_size];
+        });
+    }
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    function render(query, results) {
+        if (!query.trim()) {
+            container.innerHTML = '';
+            return;
+        }
+        if (!results.length) {
+            container.innerHTML = '<div class="text-center py-5">' +
+                '<i class="fas fa-search fa-3x text-muted mb-3"></i>' +
+                '<h3 class="text-muted">' + escapeHtml(container.dataset.noResults || '') + '</h3></div>';
+            return;
+        }
+        const lang = document.documentElement.lang || 'en';
+        container.innerHTML = results.map(function (doc, index) {
+            const url = doc[0], title = doc[1], section = doc[2], date = doc[3], snippet = doc[4];
+            const formatted = new Date(date + 'T00:00:00').toLocaleDateString(lang, {
+                year: 'numeric', month: 'long', day: 'numeric'
+            });
+            return '<article class="search-result mb-4 pb-4' + (index < results.length - 1 ? ' border-bottom' : '') + '">' +
+                '<h3><a href="' + escapeHtml(url) + '" class="text-decoration-none">' + escapeHtml(title) + '</a></h3>' +
+                '<div class="text-muted mb-2">' +
+                '<span class="badge bg-secondary me-2">' + escapeHtml(labels[section] || section) + '</span>' +
+                '<span><i class="fas fa-calendar-alt me-1"></i>' + escapeHtml(formatted) + '</span>' +
+                '</div>' +
+                '<p class="mb-0">' + escapeHtml(snippet) + '</p>' +
+                '</article>';
+        }).join('');
+    }
+
+    function run(query) {
+        search(query).then(function (results) {
+            // Ignore answers to queries the visitor has typed past
+            if (!input || input.value === query) {
+                render(query, results);
+            }
+        }).catch(function (error) {
+            console.log('Search index not available:', error);
+        });
+    }
+
+    function enable(loaded) {
+        manifest = loaded;
+        if (input) {
+            let timer = null;
+            input.addEventListener('input', function () {
+                clearTimeout(timer);
+                timer = setTimeout(function () {
+                    const url = new URL(window.location.href);
+                    url.searchParams.set('q', input.value);
+                    window.history.replaceState(null, '', url);
+                    run(input.value);
+                }, 150);
+            });
+            form.addEventListener('submit', function (event) {
+                event.preventDefault();
+                run(input.value);
+            });
+        }
+        if (urlQuery) {
+            if (input) {
+                input.value = urlQuery;
+            }
+            run(urlQuery);
+        }
+    }
+
+    // Without a static index (e.g. on the dev server) the form keeps submitting normally
+    fetchJson('index.json').then(enable).catch(function () {});
+})();
@@ -5,59 +5,30 @@ Talks Manager
 Handles talk/presentation entries with metadata and content.
 """
 
-import os
-from pathlib import Path
 from typing import List, Dict, Optional
-from datetime import datetime
-import markdown
-from markdown.extensions import meta
 
-class Talk:
-    def __init__(self, filepath: str, lang: str = 'en'):
-        self.filepath = filepath
-        self.lang = lang
-        self.metadata = {}
-        self.content = ""
-        self.html_content = ""
-        
-        self._load_content()
+from content_repository import ContentItem, ContentRepository
+
+class Talk(ContentItem):
+    MARKDOWN_EXTENSIONS = ['fenced_code', 'tables']
     
-    def _load_content(self):
-        """Load and parse the markdown file"""
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split frontmatter and content
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                # Parse YAML frontmatter
-                import yaml
-                self.metadata = yaml.safe_load(parts[1]) or {}
-                self.content = parts[2].strip()
-            else:
-                self.content = content
-        else:
-            self.content = content
+    # Derived values are computed once at load
+    __slots__ = ('abstract',)
+    
+    def _precompute(self):
+        super()._precompute()
         
-        # Convert markdown to HTML (without frontmatter)
-        md = markdown.Markdown(extensions=['fenced_code', 'tables'])
-        self.html_content = md.convert(self.content)
+        abstract = self.metadata.get('abstract', '')
+        if not abstract:
+            # Extract first paragraph as abstract
+            first_para = self.content.split('\n\n')[0]
+            abstract = first_para[:300] + '...' if len(first_para) > 300 else first_para
+        self.abstract = abstract
     
     @property
     def title(self) -> str:
         return self.metadata.get('title', 'Untitled Talk')
     
-    @property
-    def date(self) -> datetime:
-        date_str = self.metadata.get('date', '')
-        if date_str:
-            try:
-                return datetime.strptime(str(date_str), '%Y-%m-%d')
-            except:
-                pass
-        return datetime.now()
-    
     @property
     def venue(self) -> str:
         return self.metadata.get('venue', '')
@@ -66,31 +37,10 @@ class Talk:
     def location(self) -> str:
         return self.metadata.get('location', '')
     
-    @property
-    def abstract(self) -> str:
-        abstract = self.metadata.get('abstract', '')
-        if not abstract:
-            # Extract first paragraph as abstract
-            first_para = self.content.split('\n\n')[0]
-            abstract = first_para[:300] + '...' if len(first_para) > 300 else first_para
-        return abstract
-    
     @property
     def talk_type(self) -> str:
         return self.metadata.get('type', 'presentation')  # invited, contributed, poster, etc.
     
-    @property
-    def tags(self) -> List[str]:
-        tags = self.metadata.get('tags', [])
-        if isinstance(tags, str):
-            return [tag.strip() for tag in tags.split(',')]
-        return tags
-    
-    @property
-    def slug(self) -> str:
-        filename = Path(self.filepath).stem
-        return self.metadata.get('slug', filename)
-    
     @property
     def slides_url(self) -> str:
         return self.metadata.get('slides_url', '')
@@ -100,47 +50,17 @@ class Talk:
         return self.metadata.get('video_url', '')
 
 class TalksManager:
-    def __init__(self, content_dir: str = 'content/talks'):
+    def __init__(self, content_dir: str = 'content/talks', disk_cache=None):
         self.content_dir = content_dir
-        self._talks_cache = {}
+        self.repository = ContentRepository(content_dir, Talk, disk_cache=disk_cache)
     
     def get_talks(self, lang: str = 'en', limit: Optional[int] = None) -> List[Talk]:
         """Get all talks for a language, sorted by date (newest first)"""
-        talks = []
-        talks_dir = Path(self.content_dir)
-        
-        if not talks_dir.exists():
-            return talks
-        
-        # Look for markdown files
-        for file_path in talks_dir.glob('*.md'):
-            try:
-                talk = Talk(str(file_path), lang)
-                # Check if talk is for this language
-                talk_lang = talk.metadata.get('lang', 'en')
-                # Strip quotes if present
-                if isinstance(talk_lang, str):
-                    talk_lang = talk_lang.strip('"\'')
-                if talk_lang == lang:
-                    talks.append(talk)
-            except Exception as e:
-                print(f"Error loading talk {file_path}: {e}")
-        
-        # Sort by date, newest first
-        talks.sort(key=lambda t: t.date, reverse=True)
-        
-        if limit:
-            talks = talks[:limit]
-        
-        return talks
+        return self.repository.list(lang, limit)
     
     def get_talk(self, slug: str, lang: str = 'en') -> Optional[Talk]:
         """Get a specific talk by slug"""
-        talks = self.get_talks(lang)
-        for talk in talks:
-            if talk.slug == slug:
-                return talk
-        return None
+        return self.repository.get(slug, lang)
     
     def get_talks_by_type(self, talk_type: str, lang: str = 'en') -> List[Talk]:
         """Get talks filtered by type"""
@@ -149,13 +69,16 @@ class TalksManager:
     
     def get_talks_by_tag(self, tag: str, lang: str = 'en') -> List[Talk]:
         """Get talks filtered by tag"""
-        all_talks = self.get_talks(lang)
-        return [talk for talk in all_talks if tag.lower() in [t.lower() for t in talk.tags]]
+        return self.repository.by_tag(tag, lang)
     
     def get_tags(self, lang: str = 'en') -> List[str]:
         """Get all unique tags from talks"""
-        all_talks = self.get_talks(lang)
-        tags = set()
-        for talk in all_talks:
-            tags.update(talk.tags)
-        return sorted(list(tags))
\ No newline at end of file
+        return self.repository.tags(lang)
+    
+    def get_tag_counts(self, lang: str = 'en') -> Dict[str, int]:
+        """Get the number of talks per tag"""
+        return self.repository.tag_counts(lang)
+    
+    def get_related_talks(self, slug: str, lang: str = 'en', limit: int = 3) -> List:
+        """Get the talks sharing the most tags with a talk"""
+        return self.repository.related(slug, lang, limit)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared content repository
+"""
+
+import asyncio
+import os
+import re
+from datetime import datetime
+
+import pytest
+
+from blog_manager import BlogManager, BlogPost
+from content_cache import ContentCache
+from content_repository import ContentRepository, ExcerptPolicy, warm_up
+from content_watcher import ContentPoller, ContentWatcher
+from news_manager import NewsItem
+from publications_manager import Publication
+from talks_manager import Talk
+from teaching_manager import TeachingItem
+
+
+def write_post(directory, name, date, lang='en', tags=None, draft=False, body='Body text.'):
+    tags = tags or []
+    path = directory / f"{name}.md"
+    path.write_text(
+        "---\n"
+        f"title: \"{name.title()}\"\n"
+        f"date: {date}\n"
+        f"lang: {lang}\n"
+        f"tags: {tags}\n"
+        f"draft: {'true' if draft else 'false'}\n"
+        "---\n\n"
+        f"{body}\n",
+        encoding='utf-8'
+    )
+    return path
+
+
+def test_partitions_sorted_by_date(tmp_path):
+    write_post(tmp_path, 'old', '2020-01-01')
+    write_post(tmp_path, 'new', '2024-01-01')
+    write_post(tmp_path, 'french', '2023-01-01', lang='fr')
+    write_post(tmp_path, 'hidden', '2025-01-01', draft=True)
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+
+    assert [p.slug for p in repo.list('en')] == ['new', 'old']
+    assert [p.slug for p in repo.list('fr')] == ['french']
+    assert [p.slug for p in repo.list('en', limit=1)] == ['new']
+    assert repo.get('french', 'en') is None
+    assert repo.get('french', 'fr').title == 'French'
+
+
+def test_list_and_quoted_languages(tmp_path):
+    write_post(tmp_path, 'both', '2024-01-01', lang='[en, fr]')
+    write_post(tmp_path, 'quoted', '2023-01-01', lang='"\'bn\'"')
+
+    repo = ContentRepository(str(tmp_path), Publication)
+
+    assert [p.slug for p in repo.list('en')] == ['both']
+    assert [p.slug for p in repo.list('fr')] == ['both']
+    assert [p.slug for p in repo.list('bn')] == ['quoted']
+
+
+def test_malformed_dates_are_reported_and_skipped(tmp_path, capsys):
+    write_post(tmp_path, 'dated', '2024-01-01')
+    write_post(tmp_path, 'malformed', '01/02/2024')
+    (tmp_path / 'undated.md').write_text('---\ntitle: Undated\n---\n\nBody.\n', encoding='utf-8')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    assert [p.slug for p in repo.list('en')] == ['undated', 'dated']
+    assert 'malformed.md' in capsys.readouterr().out
+
+
+def test_only_changed_files_are_reparsed(tmp_path):
+    write_post(tmp_path, 'first', '2024-01-01')
+    second = write_post(tmp_path, 'second', '2023-01-01')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    repo.list('en')
+    assert repo.stats()['misses'] == 2
+
+    repo.list('en')
+    assert repo.stats() == {'hits': 2, 'misses': 2, 'entries': 2}
+
+    write_post(tmp_path, 'second', '2025-01-01', body='Edited body, now longer.')
+    assert [p.slug for p in repo.list('en')] == ['second', 'first']
+    assert repo.stats()['misses'] == 3
+
+    os.remove(second)
+    assert [p.slug for p in repo.list('en')] == ['first']
+    assert repo.stats()['entries'] == 1
+
+
+def test_unknown_slug_does_not_reparse(tmp_path):
+    write_post(tmp_path, 'only', '2024-01-01')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    assert repo.get('only', 'en').slug == 'only'
+    assert repo.get('missing', 'en') is None
+    assert repo.get('only', 'bn') is None
+    assert repo.stats()['misses'] == 1
+
+
+def test_tag_index_is_case_insensitive(tmp_path):
+    write_post(tmp_path, 'newer', '2024-01-01', tags=['Zebrafish', 'vision'])
+    write_post(tmp_path, 'older', '2020-01-01', tags=['zebrafish'])
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+
+    assert [p.slug for p in repo.by_tag('ZEBRAFISH', 'en')] == ['newer', 'older']
+    assert repo.by_tag('missing', 'en') == []
+    assert repo.tags('en') == ['vision', 'Zebrafish']
+    assert repo.tag_counts('en') == {'vision': 1, 'Zebrafish': 2}
+
+
+def test_apply_changes_patches_only_given_files(tmp_path):
+    write_post(tmp_path, 'first', '2024-01-01')
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    repo.refresh()
+    repo.auto_refresh = False
+
+    added = write_post(tmp_path, 'added', '2025-01-01')
+    assert [p.slug for p in repo.list('en')] == ['first']
+
+    assert repo.apply_changes([str(added.resolve()), '/elsewhere/other.md'])
+    assert [p.slug for p in repo.list('en')] == ['added', 'first']
+    assert repo.stats()['misses'] == 2
+
+    os.remove(added)
+    assert repo.apply_changes([str(added.resolve())])
+    assert [p.slug for p in repo.list('en')] == ['first']
+
+
+def test_disk_cache_skips_parsing_on_restart(tmp_path):
+    content_dir = tmp_path / 'blog'
+    content_dir.mkdir()
+    write_post(content_dir, 'cached', '2024-01-01', tags=['a'], body='Some *markdown*.')
+    cache = ContentCache(str(tmp_path / 'cache'))
+
+    first = ContentRepository(str(content_dir), BlogPost, disk_cache=cache).list('en')[0]
+    assert cache.hits == 0 and cache.stats()['entries'] == 1
+
+    restarted = ContentRepository(str(content_dir), BlogPost, disk_cache=cache).list('en')[0]
+    assert cache.hits == 1
+    assert restarted.metadata == first.metadata
+    assert restarted.html_content == first.html_content
+
+    write_post(content_dir, 'cached', '2024-01-01', tags=['a'], body='Edited.')
+    ContentRepository(str(content_dir), BlogPost, disk_cache=cache).list('en')
+    assert cache.prune([]) == 2
+
+
+def test_failed_cache_writes_are_misses(tmp_path, monkeypatch):
+    content_dir = tmp_path / 'blog'
+    content_dir.mkdir()
+    write_post(content_dir, 'post', '2024-01-01')
+    cache = ContentCache(str(tmp_path / 'cache'))
+
+    cache.put('0' * 64, {'metadata': {'unpicklable': lambda: None}})
+    monkeypatch.setattr('content_repository.item_to_record', lambda item: {'unpicklable': lambda: None})
+    assert [p.slug for p in ContentRepository(str(content_dir), BlogPost, disk_cache=cache).list('en')] == ['post']
+    # Nothing written, not even the temp files
+    assert not [path for path in (tmp_path / 'cache').rglob('*') if path.is_file()]
+
+
+def test_warm_up_renders_across_processes(tmp_path):
+    for index in range(4):
+        write_post(tmp_path, f'post-{index}', f'202{index}-01-01', body=f'Post **{index}**.')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    assert warm_up([repo], workers=2) == 4
+    posts = repo.list('en')
+    assert [p.slug for p in posts] == ['post-3', 'post-2', 'post-1', 'post-0']
+    assert posts[0]._html_content == '<p>Post <strong>3</strong>.</p>'
+    assert warm_up([repo], workers=2) == 0
+
+
+def test_related_ranked_by_tag_overlap(tmp_path):
+    write_post(tmp_path, 'anchor', '2024-01-01', tags=['fish', 'brain', 'posture'])
+    write_post(tmp_path, 'close', '2020-01-01', tags=['Fish', 'brain', 'posture'])
+    write_post(tmp_path, 'partial-new', '2023-01-01', tags=['fish', 'imaging'])
+    write_post(tmp_path, 'partial-old', '2021-01-01', tags=['brain', 'imaging'])
+    write_post(tmp_path, 'unrelated', '2025-01-01', tags=['teaching'])
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+
+    assert [p.slug for p in repo.related('anchor', 'en')] == ['close', 'partial-new', 'partial-old']
+    assert [p.slug for p in repo.related('anchor', 'en', limit=1)] == ['close']
+    assert repo.related('unrelated', 'en') == []
+    assert repo.related('missing', 'en') == []
+
+
+def test_since_bisects_the_date_partition(tmp_path):
+    for year in (2019, 2021, 2023, 2025):
+        write_post(tmp_path, f'post-{year}', f'{year}-06-01')
+    write_post(tmp_path, 'french', '2024-01-01', lang='fr')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+
+    assert [p.slug for p in repo.since(datetime(2021, 6, 1))] == ['post-2025', 'post-2023', 'post-2021']
+    assert [p.slug for p in repo.since(datetime(2021, 6, 1), limit=2)] == ['post-2025', 'post-2023']
+    assert repo.since(datetime(2030, 1, 1)) == []
+    assert [p.slug for p in repo.since(datetime(2000, 1, 1), 'fr')] == ['french']
+    assert repo.since(datetime(2000, 1, 1), 'bn') == []
+
+
+def test_paginate_by_page_and_cursor(tmp_path):
+    for day in range(1, 8):
+        write_post(tmp_path, f'post-{day}', f'2024-01-0{day}')
+    write_post(tmp_path, 'same-day', '2024-01-07')
+
+    repo = ContentRepository(str(tmp_path), BlogPost)
+
+    first = repo.paginate('en', per_page=3)
+    assert [p.slug for p in first['items']] == ['same-day', 'post-7', 'post-6']
+    assert (first['page'], first['pages'], first['total'], first['has_prev']) == (1, 3, 8, False)
+    assert first['prev_cursor'] is None
+
+    second = repo.paginate('en', per_page=3, cursor=first['next_cursor'])
+    assert second == repo.paginate('en', per_page=3, page=2)
+    assert [p.slug for p in second['items']] == ['post-5', 'post-4', 'post-3']
+
+    # A newly published post does not shift a cursor page
+    write_post(tmp_path, 'newest', '2024-02-01')
+    assert repo.paginate('en', per_page=3, cursor=first['next_cursor'])['items'] == second['items']
+
+    third = repo.paginate('en', per_page=3, page=3)
+    assert [p.slug for p in third['items']] == ['post-3', 'post-2', 'post-1']
+    assert third['next_cursor'] is None
+    assert repo.paginate('en', per_page=3, cursor=third['prev_cursor'])['items'][0].slug == 'post-6'
+
+    with pytest.raises(ValueError):
+        repo.paginate('en', cursor='not-a-cursor')
+
+
+@pytest.fixture
+def blog_client(tmp_path, monkeypatch):
+    """The app serving five posts from tmp_path, two per listing page"""
+    from fastapi.testclient import TestClient
+    import main
+
+    for day in range(1, 6):
+        write_post(tmp_path, f'post-{day}', f'2024-01-0{day}')
+    monkeypatch.setattr(main, 'blog_manager', BlogManager(str(tmp_path)))
+    monkeypatch.setattr(main, 'BLOG_PAGE_SIZE', 2)
+    return TestClient(main.app)
+
+
+def head_links(html):
+    """rel -> href of the <link rel="prev|next"> tags"""
+    return dict(re.findall(r'<link rel="(prev|next)" href="([^"]*)">', html))
+
+
+def test_listing_pages_link_to_their_neighbours(blog_client):
+    assert head_links(blog_client.get('/en/blog').text) == {'next': '/en/blog/page/2'}
+    assert head_links(blog_client.get('/en/blog/page/2').text) == {'prev': '/en/blog', 'next': '/en/blog/page/3'}
+    assert head_links(blog_client.get('/en/blog/page/3').text) == {'prev': '/en/blog/page/2'}
+
+    import main
+    cursor = main.blog_manager.get_posts_page('en', per_page=2)['next_cursor']
+    response = blog_client.get('/en/blog', params={'cursor': cursor})
+    assert response.status_code == 200
+    links = head_links(response.text)
+    assert links['prev'] == '/en/blog'
+    assert links['next'].startswith('/en/blog?cursor=')
+    assert 'post-3' in response.text and 'post-5' not in response.text
+
+
+def test_bad_listing_requests_are_rejected(blog_client):
+    assert blog_client.get('/en/blog', params={'cursor': 'not-a-cursor'}).status_code == 400
+    assert blog_client.get('/en/blog/page/4').status_code == 404
+    assert blog_client.get('/en/blog/page/0').status_code == 404
+
+
+def test_news_excerpt_is_rendered_once_and_cached(tmp_path):
+    content_dir = tmp_path / 'news'
+    content_dir.mkdir()
+    body = 'First sentence here. ' + 'More words follow in this item. ' * 10
+    write_post(content_dir, 'long', '2024-01-01', body=body)
+    cache = ContentCache(str(tmp_path / 'cache'))
+
+    item = ContentRepository(str(content_dir), NewsItem, disk_cache=cache).list('en')[0]
+    assert item.summary == 'First sentence here.'
+    assert item.excerpt is item.excerpt
+    assert item.excerpt.startswith('<p>First sentence here.') and item.excerpt.endswith('.</p>')
+
+    restarted = ContentRepository(str(content_dir), NewsItem, disk_cache=cache).list('en')[0]
+    assert restarted._excerpt_html == item.excerpt
+
+
+@pytest.mark.parametrize('item_class', [BlogPost, NewsItem, Publication, Talk, TeachingItem])
+def test_listings_do_not_render_bodies(tmp_path, item_class):
+    write_post(tmp_path, 'first', '2024-01-02', tags=['x'], body='Some *markdown*.')
+    write_post(tmp_path, 'second', '2024-01-01', tags=['x'], body='More *markdown*.')
+    repo = ContentRepository(str(tmp_path), item_class)
+
+    listed = repo.list('en') + repo.paginate('en', per_page=1)['items'] + repo.by_tag('x', 'en')
+    assert len(listed) == 5
+    assert all(item._html_content is None for item in listed)
+
+    assert listed[0].html_content == '<p>Some <em>markdown</em>.</p>'
+    assert listed[0]._html_content is not None
+
+
+def test_excerpt_policy_cuts():
+    text = 'word ' * 60
+    assert ExcerptPolicy(length=20).cut(text) == 'word word word word...'
+    assert ExcerptPolicy(length=20, boundary=False).cut(text) == text[:20] + '...'
+    assert ExcerptPolicy(length=20, first_paragraph=True).cut('Short.\n\nRest') == 'Short.'
+    assert not ExcerptPolicy(first_paragraph=True).fits('Short.')
+
+
+def test_reload_swaps_in_a_new_snapshot(tmp_path):
+    write_post(tmp_path, 'first', '2024-01-01', tags=['fish'])
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    repo.auto_refresh = False
+
+    held = repo.snapshot
+    version = repo.version
+    write_post(tmp_path, 'second', '2025-01-01', tags=['fish'])
+    assert repo.refresh()
+
+    # A reader holding the old snapshot keeps a consistent view
+    assert [p.slug for p in held.partition('en')] == ['first']
+    assert held.by_tag['en']['fish'] == (0,)
+    assert repo.version == version + 1
+    assert [p.slug for p in repo.by_tag('fish', 'en')] == ['second', 'first']
+    assert not repo.refresh() and repo.version == version + 1
+
+
+def test_poller_rescans_off_the_request_path(tmp_path):
+    write_post(tmp_path, 'first', '2024-01-01')
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    # Loaded at startup; the poller does not scan again until its first tick
+    repo.refresh()
+    refreshed = []
+    poller = ContentPoller([repo], interval=0.01, on_refresh=lambda: refreshed.append(repo.version))
+
+    async def run():
+        poller.start()
+        write_post(tmp_path, 'second', '2025-01-01')
+        # Readers keep the loaded snapshot until the poller has rescanned
+        assert [p.slug for p in repo.list('en')] == ['first']
+        while not refreshed:
+            await asyncio.sleep(0.01)
+        await poller.stop()
+
+    asyncio.run(run())
+    assert not repo.auto_refresh
+    assert [p.slug for p in repo.list('en')] == ['second', 'first']
+
+
+def test_watcher_runs_on_refresh_after_reloads(tmp_path):
+    write_post(tmp_path, 'first', '2024-01-01')
+    repo = ContentRepository(str(tmp_path), BlogPost)
+    repo.refresh()
+    refreshed = []
+    watcher = ContentWatcher([repo], on_refresh=lambda: refreshed.append(repo.version))
+
+    watcher.apply([str(write_post(tmp_path, 'second', '2025-01-01'))])
+    watcher.apply([str(tmp_path / 'unrelated.txt')])
+    assert refreshed == [repo.version]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for faceted publication queries
+"""
+
+from facet_index import FacetIndex
+from publications_manager import PublicationsManager
+
+
+def write_publication(directory, name, date, pub_type, tags, authors):
+    path = directory / f"{name}.md"
+    path.write_text(
+        "---\n"
+        f"title: \"{name.title()}\"\n"
+        f"date: {date}\n"
+        "lang: en\n"
+        f"type: {pub_type}\n"
+        f"tags: {tags}\n"
+        f"authors: \"{authors}\"\n"
+        "---\n\n"
+        "Abstract.\n",
+        encoding='utf-8'
+    )
+
+
+def test_facets_intersect_and_count_against_other_filters():
+    items = ['a', 'b', 'c', 'd']
+    index = FacetIndex(items, {
+        'colour': lambda item: ['Red'] if item in 'ab' else ['blue'],
+        'size': lambda item: ['small'] if item in 'ac' else ['large'],
+    })
+
+    assert index.query({}) == (items, {'colour': {'Red': 2, 'blue': 2}, 'size': {'small': 2, 'large': 2}})
+
+    selected, counts = index.query({'colour': ['red'], 'size': None})
+    assert selected == ['a', 'b']
+    # Colour counts ignore the colour filter itself
+    assert counts == {'colour': {'Red': 2, 'blue': 2}, 'size': {'small': 1, 'large': 1}}
+
+    assert index.query({'colour': ['RED', 'blue'], 'size': ['large']})[0] == ['b', 'd']
+    assert index.query({'colour': ['green']})[0] == []
+
+
+def test_query_publications(tmp_path):
+    write_publication(tmp_path, 'fish-2024', '2024-05-01', 'journal', ['Zebrafish', 'posture'], 'A. Author, B. Author')
+    write_publication(tmp_path, 'fish-2020', '2020-05-01', 'preprint', ['zebrafish'], 'A. Author')
+    write_publication(tmp_path, 'teaching-2016', '2016-05-01', 'journal', ['education'], 'C. Author')
+
+    manager = PublicationsManager(str(tmp_path))
+
+    result = manager.query_publications('en', year_from=2018, tags=['zebrafish'])
+    assert [p.slug for p in result['items']] == ['fish-2024', 'fish-2020']
+    assert result['facets']['year'] == {2024: 1, 2020: 1}
+    assert result['facets']['type'] == {'journal': 1, 'preprint': 1}
+
+    assert [p.slug for p in manager.query_publications('en', types=['journal'], authors=['b. author'])['items']] == ['fish-2024']
+    assert manager.query_publications('en', year_from=2021, year_to=2023)['items'] == []
+    assert [p.slug for p in manager.get_publications_by_type('journal')] == ['fish-2024', 'teaching-2016']
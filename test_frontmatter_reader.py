@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the frontmatter reader
+"""
+
+from pathlib import Path
+
+import yaml
+
+from frontmatter_reader import parse_header, read_frontmatter
+
+
+def test_fast_path_matches_yaml():
+    header = (
+        'title: "Nouveau site web en ligne"\n'
+        "subtitle: 'single quoted'\n"
+        'date: 2026-06-27\n'
+        'year: "2024"\n'
+        'count: 12\n'
+        'draft: true\n'
+        'enabled: yes\n'
+        'author: Sharbatanu Chatterjee\n'
+        'tags: ["website", "général", "নতুন"]\n'
+        'empty: []\n'
+    )
+    assert parse_header(header) == yaml.safe_load(header)
+
+
+def test_falls_back_to_yaml_for_nested_headers():
+    header = (
+        'title: "Rolling"\n'
+        'abstract: |\n'
+        ' First line\n'
+        ' second line\n'
+        'authors:\n'
+        '  - A\n'
+        '  - B\n'
+    )
+    assert parse_header(header) == yaml.safe_load(header)
+
+
+def test_read_frontmatter_stops_at_closing_delimiter(tmp_path):
+    path = tmp_path / 'post.md'
+    path.write_text('---\ntitle: "Post"\n---\n\nIntro\n\n---\n\nAfter a rule\n', encoding='utf-8')
+
+    assert read_frontmatter(path) == ({'title': 'Post'}, 'Intro\n\n---\n\nAfter a rule')
+    assert read_frontmatter(path, with_body=False) == ({'title': 'Post'}, '')
+
+
+def test_files_without_frontmatter(tmp_path):
+    path = tmp_path / 'plain.md'
+    path.write_text('# Just markdown\n', encoding='utf-8')
+    assert read_frontmatter(path) == ({}, '# Just markdown\n')
+
+    unclosed = tmp_path / 'unclosed.md'
+    unclosed.write_text('---\ntitle: "x"\n', encoding='utf-8')
+    assert read_frontmatter(unclosed) == ({}, '---\ntitle: "x"\n')
+
+
+def test_repository_content_parses_like_yaml():
+    for path in Path('content').glob('*/*.md'):
+        text = path.read_text(encoding='utf-8')
+        if not text.startswith('---'):
+            continue
+        parts = text.split('---', 2)
+        assert read_frontmatter(path) == (yaml.safe_load(parts[1]) or {}, parts[2].strip())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the notebook HTML sanitizer
+"""
+
+from html_sanitizer import clean_notebook_html, split_cells
+
+
+def test_keeps_the_notebook_container_contents():
+    html = '''<!DOCTYPE html><html><head><style>body { color: red; }</style>
+<script>if (a < b) { document.write("</div>"); }</script></head>
+<body class="jp-Notebook" data-theme="light"><main>
+<div class="jp-Cell jp-Notebook-cell"><div><p>x &lt; y &amp; z&#39;s</p></div></div>
+<div class="jp-Cell"><img alt="plot" src="a.png"/><br><body class="inner"></body>
+<script type="text/javascript">alert(1)</script><!-- note --></div>
+</main></body></html>'''
+    assert clean_notebook_html(html) == '''<div class="notebook-content"><main>
+<div class="jp-Cell jp-Notebook-cell"><div><p>x &lt; y &amp; z&#39;s</p></div></div>
+<div class="jp-Cell"><img alt="plot" src="a.png"/><br><body class="inner"></body>
+<!-- note --></div>
+</main></div>'''
+
+
+def test_falls_back_to_cells_then_everything():
+    html = '<h1>Title</h1><div class="cell code_cell"><div>in</div></div><p>between</p><div class="cell">two</div>'
+    assert clean_notebook_html(html) == ('<div class="notebook-content"><div class="cell code_cell"><div>in</div>'
+                                         '</div><div class="cell">two</div></div>')
+    assert clean_notebook_html('<p>plain</p><style>p {}</style>') == '<div class="notebook-content"><p>plain</p></div>'
+
+
+def test_splits_top_level_cells():
+    html = clean_notebook_html('<body class="jp-Notebook"><main><div class="jp-Cell a"><div class="jp-Cell-x">1</div>'
+                               '</div>\n<div class="jp-Cell b">2</div></main></body>')
+    assert split_cells(html) == ['<div class="jp-Cell a"><div class="jp-Cell-x">1</div></div>',
+                                 '<div class="jp-Cell b">2</div>']
+    assert split_cells('<div class="alert">Conversion error</div>') == []
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for content-addressed notebook images
+"""
+
+import base64
+import hashlib
+import json
+import struct
+import zlib
+
+from notebook_assets import image_size, missing_assets, publish_images
+from notebook_manager import NotebookManager
+
+
+def png(width, height):
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    rows = b''.join(b'\0' + b'\xff' * width * 3 for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+def test_images_are_written_once_under_their_hash(tmp_path):
+    image = png(30, 20)
+    name = hashlib.sha256(image).hexdigest() + '.png'
+    assert image_size(image) == (30, 20)
+
+    html = '<p><img alt="plot" src="output_1_0.png"/></p><img src="output_2_0.png" width="10"/>'
+    outputs = {'output_1_0.png': image, 'output_2_0.png': image}
+    published = publish_images(html, outputs, str(tmp_path), '/assets')
+    assert published == (f'<p><img alt="plot" src="/assets/{name}" loading="lazy" decoding="async" '
+                         f'width="30" height="20"/></p>'
+                         f'<img src="/assets/{name}" loading="lazy" decoding="async" width="10"/>')
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+    assert not missing_assets(published, str(tmp_path), '/assets')
+    (tmp_path / name).unlink()
+    assert missing_assets(published, str(tmp_path), '/assets')
+
+
+def test_notebook_outputs_are_extracted(tmp_path):
+    image = png(4, 3)
+    (tmp_path / 'plots.ipynb').write_text(json.dumps({
+        'cells': [{'cell_type': 'code', 'execution_count': 1, 'id': 'plot', 'metadata': {}, 'source': ['plot()'],
+                   'outputs': [{'data': {'image/png': base64.b64encode(image).decode()}, 'metadata': {},
+                                'output_type': 'display_data'}]}],
+        'metadata': {},
+        'nbformat': 4,
+        'nbformat_minor': 5,
+    }), encoding='utf-8')
+    assets = tmp_path / 'assets'
+    manager = NotebookManager(str(tmp_path), assets_dir=str(assets))
+
+    html = manager.convert_to_html('plots')
+    name = hashlib.sha256(image).hexdigest() + '.png'
+    assert 'data:image/png' not in html
+    assert f'src="/static/notebooks/_assets/{name}" loading="lazy" decoding="async" width="4" height="3"' in html
+    assert (assets / name).read_bytes() == image
+
+    # A cached page whose image was deleted is converted again
+    (assets / name).unlink()
+    restarted = NotebookManager(str(tmp_path), html_cache=manager.html_cache, assets_dir=str(assets))
+    assert restarted.convert_to_html('plots') == html
+    assert (assets / name).exists()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the notebook HTML cache
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from notebook_cache import NotebookCache
+from notebook_manager import NotebookBusy, NotebookManager
+
+
+def write_notebook(path, text):
+    path.write_text(json.dumps({
+        'cells': [{'cell_type': 'markdown', 'id': 'intro', 'metadata': {}, 'source': [text]}],
+        'metadata': {},
+        'nbformat': 4,
+        'nbformat_minor': 5,
+    }), encoding='utf-8')
+
+
+def test_memory_tier_evicts_least_recently_used_bytes():
+    cache = NotebookCache(max_bytes=10)
+    cache.put('a', 'aaaa')
+    cache.put('b', 'bbbb')
+    assert cache.get('a') == 'aaaa'
+    cache.put('c', 'cccc')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'aaaa' and cache.get('c') == 'cccc'
+    assert cache.stats()['bytes'] == 8
+
+    cache.put('huge', 'x' * 11)
+    assert cache.get('huge') is None and cache.stats()['entries'] == 2
+
+
+def test_disk_tier_survives_restarts_and_stays_within_budget(tmp_path):
+    cache = NotebookCache(str(tmp_path), max_disk_bytes=10)
+    cache.put('a1', 'aaaa')
+    cache.put('b1', 'bbbb')
+    assert NotebookCache(str(tmp_path)).get('a1') == 'aaaa'
+
+    cache.put('c1', 'cccc')
+    assert sorted(path.stem for path in cache.entries()) == ['b1', 'c1']
+
+
+def test_conversion_is_cached_by_content_hash(tmp_path):
+    notebook = tmp_path / 'analysis.ipynb'
+    write_notebook(notebook, '# First version')
+    manager = NotebookManager(str(tmp_path), html_cache=NotebookCache(str(tmp_path / 'cache')))
+
+    html = manager.convert_to_html('analysis')
+    assert html.startswith('<div class="notebook-content">')
+    assert manager.convert_to_html('analysis') is html
+    assert manager.html_cache.stats()['misses'] == 1
+
+    restarted = NotebookManager(str(tmp_path), html_cache=NotebookCache(str(tmp_path / 'cache')))
+    assert restarted.convert_to_html('analysis') == html
+    assert restarted.html_cache.stats() == {'hits': 1, 'misses': 0, 'entries': 1, 'bytes': len(html.encode())}
+
+    write_notebook(notebook, '# Second version')
+    manager.convert_to_html('analysis')
+    assert manager.html_cache.stats()['misses'] == 2
+
+
+def test_render_html_converts_in_the_pool_and_sheds_load(tmp_path):
+    write_notebook(tmp_path / 'analysis.ipynb', '# Pooled')
+    manager = NotebookManager(str(tmp_path), workers=1)
+    try:
+        html = asyncio.run(manager.render_html('analysis'))
+        assert html == NotebookManager._convert(str(tmp_path / 'analysis.ipynb'))[0]
+        assert manager.html_cache.stats()['entries'] == 1
+        assert asyncio.run(manager.render_html('missing')) is None
+
+        manager.html_cache.clear()
+        manager.max_pending = 0
+        with pytest.raises(NotebookBusy):
+            asyncio.run(manager.render_html('analysis'))
+    finally:
+        manager.shutdown()
+
+
+def test_cells_are_served_in_bounded_ranges(tmp_path):
+    (tmp_path / 'long.ipynb').write_text(json.dumps({
+        'cells': [{'cell_type': 'markdown', 'id': f'cell-{index}', 'metadata': {}, 'source': [f'Cell {index}']}
+                  for index in range(25)],
+        'metadata': {},
+        'nbformat': 4,
+        'nbformat_minor': 5,
+    }), encoding='utf-8')
+    manager = NotebookManager(str(tmp_path), workers=1)
+    try:
+        cells = asyncio.run(manager.render_cells('long'))
+    finally:
+        manager.shutdown()
+    assert len(cells) == 25 and 'Cell 24' in cells[-1]
+    page = manager.convert_to_html('long')
+    assert all(cell in page for cell in cells)
+
+    html, next_cell = NotebookManager.select_cells(cells, 0, 10, 10 ** 6)
+    assert html == ''.join(cells[:10]) and next_cell == 10
+    assert NotebookManager.select_cells(cells, 20, 10, 10 ** 6) == (''.join(cells[20:]), None)
+    # The size limit stops a range early, but never before its first cell
+    assert NotebookManager.select_cells(cells, 3, 10, 1) == (cells[3], 4)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming notebook metadata scan
+"""
+
+import json
+
+from notebook_manager import NotebookManager
+from notebook_metadata import scan_notebook
+
+
+def plot_cell(index, size):
+    return {'cell_type': 'code', 'execution_count': index, 'id': f'plot-{index}', 'metadata': {},
+            'outputs': [{'data': {'image/png': 'A' * size}, 'metadata': {}, 'output_type': 'display_data'}],
+            'source': ['plot()']}
+
+
+def test_listing_reads_kilobytes_of_large_notebooks(tmp_path):
+    notebook = {
+        'cells': [{'cell_type': 'markdown', 'id': 'intro', 'metadata': {'tags': []}, 'source': ['# Wind tunnel\n']}]
+        + [plot_cell(index, 1024 * 1024) for index in range(4)],
+        'metadata': {'custom': {'lang': 'fr', 'date': '2024-05-01', 'tags': ['larva']},
+                     'kernelspec': {'name': 'python3'}},
+        'nbformat': 4,
+        'nbformat_minor': 5,
+    }
+    path = tmp_path / 'tunnel.ipynb'
+    path.write_text(json.dumps(notebook, indent=1, sort_keys=True), encoding='utf-8')
+
+    scan = scan_notebook(path)
+    assert scan['metadata'] == notebook['metadata']
+    assert scan['title'] == 'Wind tunnel'
+    assert scan['bytes_read'] < 64 * 1024 < path.stat().st_size
+
+    info = NotebookManager(str(tmp_path)).get_notebook('tunnel', 'fr')
+    assert (info['title'], info['date'], info['tags']) == ('Wind tunnel', '2024-05-01', ['larva'])
+
+
+def test_unusual_layouts_are_still_read(tmp_path):
+    path = tmp_path / 'hand-written.ipynb'
+    # Metadata first, the heading after a large cell, no trailing newline
+    path.write_text(json.dumps({
+        'metadata': {'custom': {'description': 'Cells with "metadata": {} in them'}},
+        'cells': [plot_cell(1, 200 * 1024),
+                  {'cell_type': 'markdown', 'metadata': {}, 'source': '# \nText\n# Late heading'}],
+        'nbformat': 4,
+    }), encoding='utf-8')
+    scan = scan_notebook(path)
+    assert scan['metadata'] == {'custom': {'description': 'Cells with "metadata": {} in them'}}
+    assert scan['title'] == 'Late heading'
+
+    path.write_text(json.dumps({'cells': [], 'metadata': {'custom': {'title': 'Given'}}}), encoding='utf-8')
+    assert scan_notebook(path) == {'metadata': {'custom': {'title': 'Given'}}, 'title': None,
+                                   'bytes_read': path.stat().st_size}
+
+
+def test_notebooks_in_several_languages_are_listed_in_each(tmp_path):
+    for name, lang in (('both', ['en', 'fr']), ('english', 'en')):
+        (tmp_path / f'{name}.ipynb').write_text(json.dumps({
+            'cells': [], 'metadata': {'custom': {'lang': lang, 'title': name.title()}}, 'nbformat': 4,
+        }), encoding='utf-8')
+
+    manager = NotebookManager(str(tmp_path))
+    assert sorted(n['slug'] for n in manager.get_notebooks('en')) == ['both', 'english']
+    assert [n['slug'] for n in manager.get_notebooks('fr')] == ['both']
+    assert manager.get_notebook('both', 'fr')['title'] == 'Both'
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text search index
+"""
+
+from blog_manager import BlogPost
+from content_repository import ContentRepository
+from search_index import SearchIndex, shard_name, tokenize
+
+
+def write_item(directory, name, title, body, lang='en', date='2024-01-01'):
+    path = directory / f"{name}.md"
+    path.write_text(
+        "---\n"
+        f"title: \"{title}\"\n"
+        f"date: {date}\n"
+        f"lang: {lang}\n"
+        "---\n\n"
+        f"{body}\n",
+        encoding='utf-8'
+    )
+    return path
+
+
+def test_tokenize_keeps_bengali_words_and_folds_accents():
+    assert tokenize('মস্তিষ্কের গবেষণা।', 'bn') == ['মস্তিষ্ক', 'গবেষণা']
+    assert tokenize("L'analyse détaillée des Poissons-zèbres", 'fr') == ['analyse', 'detaillee', 'poisson', 'zebre']
+    assert tokenize('The brains of the fish in this class', 'en') == ['brain', 'fish', 'class']
+
+
+def test_search_ranks_title_matches_first(tmp_path):
+    write_item(tmp_path, 'body-only', 'Field notes', 'We looked at zebrafish posture all week.')
+    write_item(tmp_path, 'in-title', 'Zebrafish posture', 'A short note.')
+    write_item(tmp_path, 'unrelated', 'Teaching', 'Nothing to see here.')
+    write_item(tmp_path, 'french', 'Posture du poisson-zèbre', 'Une étude détaillée.', lang='fr')
+
+    index = SearchIndex({'blog': ContentRepository(str(tmp_path), BlogPost)})
+
+    results = index.search('zebrafish posture', 'en')
+    assert [r['item'].slug for r in results] == ['in-title', 'body-only']
+    assert results[0]['url'] == '/en/blog/in-title'
+    assert [r['item'].slug for r in index.search('ETUDE detaillee', 'fr')] == ['french']
+    assert index.search('the', 'en') == []
+    assert index.search('posture', 'bn') == []
+
+
+def test_index_follows_repository_changes(tmp_path):
+    write_item(tmp_path, 'first', 'First', 'Calcium imaging.')
+    second = write_item(tmp_path, 'second', 'Second', 'Behaviour.')
+    repository = ContentRepository(str(tmp_path), BlogPost)
+    index = SearchIndex({'blog': repository})
+
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+
+    write_item(tmp_path, 'second', 'Second', 'Calcium imaging again.', date='2024-02-01')
+    assert index.refresh() == 1
+    assert index.stats()['documents'] == 2
+    assert {r['item'].slug for r in index.search('calcium', 'en')} == {'first', 'second'}
+    assert index.search('behaviour', 'en') == []
+
+    second.unlink()
+    assert [r['item'].slug for r in index.search('calcium', 'en')] == ['first']
+
+
+def test_reindexing_leaves_the_published_index_alone(tmp_path):
+    write_item(tmp_path, 'first', 'First', 'Calcium imaging.')
+    index = SearchIndex({'blog': ContentRepository(str(tmp_path), BlogPost)})
+    index.refresh()
+    published = index._state
+    postings = {term: dict(documents) for term, documents in published.languages['en'].postings.items()}
+
+    write_item(tmp_path, 'second', 'Second', 'Calcium again.')
+    assert index.refresh() == 1
+    # Searches already running keep reading the index they started with
+    assert index._state is not published
+    assert published.languages['en'].postings == postings
+    assert len(index.search('calcium', 'en')) == 2
+
+
+def test_export_shards_by_prefix(tmp_path):
+    write_item(tmp_path, 'old', 'Brain imaging', 'Calcium.', date='2020-01-01')
+    write_item(tmp_path, 'new', 'Brain posture', 'Bright light.', date='2024-01-01')
+    write_item(tmp_path, 'french', 'Cerveau', 'Équilibre.', lang='fr')
+
+    index = SearchIndex({'blog': ContentRepository(str(tmp_path), BlogPost)})
+    files = index.export('en', chunk_size=1)
+
+    manifest = files['index.json']
+    assert manifest['documents'] == 2
+    assert manifest['shards'] == sorted(path[len('terms/'):-len('.json')] for path in files if path.startswith('terms/'))
+
+    # Document ids follow date order, newest first
+    assert files['docs/0.json'][0][:4] == ['/en/blog/new', 'Brain posture', 'blog', '2024-01-01']
+    assert files['docs/1.json'][0][0] == '/en/blog/old'
+
+    # Postings are delta-encoded ids with precomputed scores
+    shard = files[f"terms/{shard_name('brain')}.json"]
+    assert set(shard) == {'brain', 'bright'}
+    ids, scores = shard['brain'][0::2], shard['brain'][1::2]
+    assert ids == [0, 1] and all(score > 0 for score in scores)
+    assert 'cerveau' not in str(files)
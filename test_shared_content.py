@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped shared content file
+"""
+
+import os
+
+from blog_manager import BlogPost
+from content_repository import ContentRepository, ExcerptPolicy
+from news_manager import NewsItem
+from shared_content import SharedText, share_content
+from test_content_repository import write_post
+
+
+def make_repositories(tmp_path):
+    return [ContentRepository(str(tmp_path / 'blog'), BlogPost),
+            ContentRepository(str(tmp_path / 'news'), NewsItem)]
+
+
+def test_workers_map_the_same_rendered_html(tmp_path):
+    for kind in ('blog', 'news'):
+        (tmp_path / kind).mkdir()
+        write_post(tmp_path / kind, 'first', '2024-01-01', body='Some *markdown* in ' + kind + '.')
+        write_post(tmp_path / kind, 'second', '2023-01-01', lang='fr', body='Du texte.')
+    path = str(tmp_path / 'shared.bin')
+
+    private = make_repositories(tmp_path)
+    shared = share_content(make_repositories(tmp_path), path)
+    built_at = os.stat(path).st_mtime_ns
+
+    # A second worker maps the existing file without rebuilding it
+    worker = make_repositories(tmp_path)
+    assert share_content(worker, path).stats()['items'] == shared.stats()['items'] == 4
+    assert os.stat(path).st_mtime_ns == built_at
+
+    for mapped, parsed in zip(worker, private):
+        post = mapped.get('first', 'en')
+        assert isinstance(post._html_content, SharedText)
+        assert post.html_content == parsed.get('first', 'en').html_content
+        assert [p.slug for p in mapped.list('fr')] == ['second']
+        assert mapped.stats()['misses'] == 0
+    assert worker[1].get('first', 'en').excerpt == private[1].get('first', 'en').excerpt
+
+
+def test_edited_content_rebuilds_the_file(tmp_path):
+    (tmp_path / 'blog').mkdir()
+    (tmp_path / 'news').mkdir()
+    write_post(tmp_path / 'blog', 'post', '2024-01-01', body='Old text.')
+    path = str(tmp_path / 'shared.bin')
+    share_content(make_repositories(tmp_path), path)
+
+    write_post(tmp_path / 'blog', 'post', '2024-01-01', body='New, longer text.')
+    repositories = make_repositories(tmp_path)
+    share_content(repositories, path)
+
+    assert repositories[0].get('post', 'en').html_content == '<p>New, longer text.</p>'
+    assert isinstance(repositories[0].get('post', 'en')._html_content, SharedText)
+
+
+def test_changed_excerpt_policy_rebuilds_the_file(tmp_path, monkeypatch):
+    (tmp_path / 'blog').mkdir()
+    (tmp_path / 'news').mkdir()
+    write_post(tmp_path / 'news', 'item', '2024-01-01', body='A fairly long piece of news.')
+    path = str(tmp_path / 'shared.bin')
+    share_content(make_repositories(tmp_path), path)
+
+    monkeypatch.setattr(NewsItem, 'EXCERPT_POLICY', ExcerptPolicy(length=8, boundary=False))
+    repositories = make_repositories(tmp_path)
+    share_content(repositories, path)
+
+    assert repositories[1].get('item', 'en').excerpt == '<p>A fairly...</p>'